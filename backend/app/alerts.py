@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+import threading
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .models import Alert, AlertEvent
+
+ALERT_DEBOUNCE_SECONDS = 600
+
+RuleKey = Tuple[Optional[str], Optional[str]]
+
+
+class AlertIndex:
+    def __init__(self, debounce_seconds: float = ALERT_DEBOUNCE_SECONDS) -> None:
+        self.debounce = timedelta(seconds=debounce_seconds)
+        self.loaded = False
+        self._version = 0
+        self._signature: Optional[Tuple[int, Optional[int]]] = None
+        self._buckets: Dict[RuleKey, Tuple[List[Any], List[int]]] = {}
+        self._last_triggered: Dict[int, datetime] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(ids) for _, ids in self._buckets.values())
+
+    def compile(self, rules: Iterable[Tuple[int, Dict[str, Any]]], version: Optional[int] = None) -> None:
+        buckets: Dict[RuleKey, Tuple[List[Any], List[int]]] = {}
+        for alert_id, rule in rules:
+            key = (rule.get("symbol") or None, rule.get("direction") or None)
+            thresholds, ids = buckets.setdefault(key, ([], []))
+            threshold = rule.get("min_confidence") or 0
+            position = bisect_right(thresholds, threshold)
+            thresholds.insert(position, threshold)
+            ids.insert(position, alert_id)
+        with self._lock:
+            self._buckets = buckets
+            self.loaded = version is None or version == self._version
+
+    def load(self, session: Session) -> None:
+        version = self._version
+        alerts = session.query(Alert.id, Alert.rule_json).filter(Alert.enabled.is_(True)).all()
+        self._signature = (len(alerts), max((alert_id for alert_id, _ in alerts), default=None))
+        last_rows = (
+            session.query(AlertEvent.alert_id, func.max(AlertEvent.triggered_at))
+            .group_by(AlertEvent.alert_id)
+            .all()
+        )
+        self.record({alert_id: triggered_at for alert_id, triggered_at in last_rows if triggered_at})
+        self.compile(((alert_id, json.loads(rule_json)) for alert_id, rule_json in alerts), version)
+
+    def refresh(self, session: Session) -> None:
+        if self.loaded:
+            signature = session.query(func.count(Alert.id), func.max(Alert.id)).filter(Alert.enabled.is_(True)).one()
+            if tuple(signature) == self._signature:
+                return
+        self.load(session)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self.loaded = False
+
+    def match(self, symbols: Iterable[str], direction: str, confidence: Any) -> List[int]:
+        buckets = self._buckets
+        matched: List[int] = []
+        for symbol in (None, *dict.fromkeys(symbols)):
+            for key in dict.fromkeys(((symbol, None), (symbol, direction))):
+                bucket = buckets.get(key)
+                if bucket is None:
+                    continue
+                thresholds, ids = bucket
+                matched.extend(ids[: bisect_right(thresholds, confidence)])
+        return sorted(matched)
+
+    def last_triggered(self, alert_id: int) -> Optional[datetime]:
+        return self._last_triggered.get(alert_id)
+
+    def is_debounced(self, alert_id: int, now: datetime, fired: Optional[Dict[int, datetime]] = None) -> bool:
+        recent = (fired or {}).get(alert_id) or self._last_triggered.get(alert_id)
+        return recent is not None and now - recent < self.debounce
+
+    def record(self, fired: Dict[int, datetime]) -> None:
+        with self._lock:
+            for alert_id, triggered_at in fired.items():
+                recent = self._last_triggered.get(alert_id)
+                if recent is None or triggered_at > recent:
+                    self._last_triggered[alert_id] = triggered_at
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets = {}
+            self._last_triggered.clear()
+            self.loaded = False
+
+
+alert_index = AlertIndex()
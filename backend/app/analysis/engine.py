@@ -1,11 +1,25 @@
 from __future__ import annotations
 
+import copy
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Set, Tuple
 
-from langdetect import detect
+from cachetools import TTLCache
+from ..metrics import analyze_seconds
+from ..utils.text import clean_text, content_hash
+from .language import detect_language
 
-from ..utils.text import clean_text
+try:
+    import ahocorasick
+except Exception:  # noqa: BLE001
+    ahocorasick = None
 
 try:
     import spacy
@@ -14,25 +28,45 @@ try:
 except Exception:  # noqa: BLE001
     _NLP = None
 
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "0"))
+ANALYSIS_POOL_MIN_BATCH = int(os.getenv("ANALYSIS_POOL_MIN_BATCH", "16"))
+ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", "4096"))
+ANALYSIS_CACHE_TTL_SECONDS = int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", "3600"))
 
 SYMBOL_RULES = {
-    "XAU/USD": ["gold", "xau", "bullion", "real yields", "inflation", "geopolitics"],
+    "XAU/USD": ["gold", "xau", "bullion", "real yields", "inflation", "inflationary", "geopolitics"],
     "DXY": ["dollar index", "dxy", "usd strength"],
-    "EUR/USD": ["eurusd", "euro", "ecb"],
+    "EUR/USD": ["eurusd", "euro", "eurozone", "euro area", "ecb"],
     "USD/JPY": ["usdjpy", "yen", "boj"],
     "GBP/USD": ["gbpusd", "pound", "boe"],
     "WTI": ["wti", "crude", "oil"],
-    "BTC": ["bitcoin", "btc", "crypto"],
+    "BTC": ["bitcoin", "btc", "crypto", "cryptocurrency", "cryptocurrencies"],
 }
 
 TOPIC_RULES = {
     "Fed": ["federal reserve", "powell", "rate hike", "rate cut"],
-    "CPI": ["cpi", "inflation", "price index"],
+    "CPI": ["cpi", "inflation", "inflationary", "price index"],
     "Geopolitics": ["war", "conflict", "sanctions"],
     "Risk-off": ["risk-off", "safe haven", "flight to safety"],
-    "Real yields": ["real yields", "treasury", "yields"],
+    "Real yields": ["real yields", "treasury", "treasuries", "yields"],
 }
 
+TRIGGER_RULES = {
+    "risk_off": ["risk-off", "flight to safety"],
+    "yields": ["real yields", "yields"],
+    "higher": ["higher"],
+    "dovish": ["rate cut", "dovish"],
+    "hawkish": ["rate hike", "hawkish"],
+    "geo_risk": ["geopolitics", "conflict"],
+}
+
+
+class AnalysisRequest(NamedTuple):
+    title: str
+    summary: str
+    content: str
+    language_hint: Optional[str] = None
+
 
 @dataclass
 class AnalysisResult:
@@ -55,26 +89,217 @@ def _extract_entities(text: str) -> List[str]:
     return sorted({ent.text for ent in doc.ents})
 
 
-def _match_rules(text: str, rules: Dict[str, List[str]]) -> List[str]:
-    matches = []
-    lowered = text.lower()
-    for key, keywords in rules.items():
-        if any(keyword in lowered for keyword in keywords):
-            matches.append(key)
-    return matches
+@dataclass
+class RuleHits:
+    symbols: List[str]
+    topics: List[str]
+    triggers: Set[str]
+
+
+RulesSignature = Tuple[Tuple[str, Tuple[Tuple[str, Tuple[str, ...]], ...]], ...]
+
+
+def _rule_tables() -> Dict[str, Dict[str, List[str]]]:
+    return {"symbols": SYMBOL_RULES, "topics": TOPIC_RULES, "triggers": TRIGGER_RULES}
+
+
+def rules_signature() -> RulesSignature:
+    return tuple(
+        (name, tuple((key, tuple(keywords)) for key, keywords in rules.items()))
+        for name, rules in _rule_tables().items()
+    )
+
+
+def _trie_pattern(keywords: List[str]) -> str:
+    trie: Dict[str, Any] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _trie_node_pattern(trie)
+
+
+def _trie_node_pattern(node: Dict[str, Any]) -> str:
+    optional = "" in node
+    branches = [re.escape(char) + _trie_node_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    if len(branches) == 1 and not optional:
+        return branches[0]
+    chars = [branch for branch in branches if len(branch) == 1]
+    if len(chars) == len(branches) and len(chars) > 1:
+        body = "[" + "".join(chars) + "]"
+    else:
+        body = "(?:" + "|".join(branches) + ")"
+    return body + "?" if optional else body
+
+
+def _keyword_pattern(keywords: List[str]) -> str:
+    return rf"\b({_trie_pattern(keywords)})s?(?!\w)"
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class RuleMatcher:
+    def __init__(self, signature: RulesSignature) -> None:
+        self.signature = signature
+        self._order: Dict[str, Dict[str, int]] = {}
+        direct: Dict[str, Set[Tuple[str, str]]] = {}
+        for name, rules in signature:
+            self._order[name] = {key: position for position, (key, _) in enumerate(rules)}
+            for key, keywords in rules:
+                for keyword in keywords:
+                    direct.setdefault(keyword.lower(), set()).add((name, key))
+
+        self._hits: Dict[str, FrozenSet[Tuple[str, str]]] = {}
+        for keyword in direct:
+            hits: Set[Tuple[str, str]] = set()
+            for other, other_hits in direct.items():
+                if re.search(_keyword_pattern([other]), keyword):
+                    hits |= other_hits
+            self._hits[keyword] = frozenset(hits)
+
+        self._automaton = None
+        self._pattern = None
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in direct:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+        else:
+            self._pattern = re.compile(_keyword_pattern(list(direct)))
+
+    def _keywords(self, lowered: str) -> Set[str]:
+        if self._automaton is None:
+            return set(self._pattern.findall(lowered))
+        found: Set[str] = set()
+        length = len(lowered)
+        for end, keyword in self._automaton.iter(lowered):
+            if keyword in found:
+                continue
+            start = end - len(keyword) + 1
+            if start > 0 and _is_word_char(lowered[start - 1]):
+                continue
+            after = end + 1
+            if after < length and lowered[after] == "s":
+                after += 1
+            if after < length and _is_word_char(lowered[after]):
+                continue
+            found.add(keyword)
+        return found
+
+    def scan(self, text: str) -> RuleHits:
+        found: Dict[str, Set[str]] = {name: set() for name in self._order}
+        for keyword in self._keywords(text.lower()):
+            for name, key in self._hits[keyword]:
+                found[name].add(key)
+        return RuleHits(
+            symbols=sorted(found["symbols"], key=self._order["symbols"].__getitem__),
+            topics=sorted(found["topics"], key=self._order["topics"].__getitem__),
+            triggers=found["triggers"],
+        )
+
+
+_matcher: Optional[RuleMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def _matcher_for(signature: RulesSignature) -> RuleMatcher:
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None or _matcher.signature != signature:
+            _matcher = RuleMatcher(signature)
+        return _matcher
 
 
-def analyze_item(title: str, summary: str, content: str) -> AnalysisResult:
+def get_matcher() -> RuleMatcher:
+    signature = rules_signature()
+    matcher = _matcher
+    if matcher is not None and matcher.signature == signature:
+        return matcher
+    return _matcher_for(signature)
+
+
+class AnalysisCache:
+    def __init__(self, maxsize: int = 4096, ttl_seconds: int = 3600) -> None:
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+        self._signature: Optional[RulesSignature] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: str, signature: RulesSignature) -> Optional[AnalysisResult]:
+        with self._lock:
+            if signature != self._signature:
+                if self._signature is not None:
+                    self.invalidations += 1
+                self._cache.clear()
+                self._signature = signature
+            result = self._cache.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return copy.deepcopy(result)
+
+    def put(self, key: str, signature: RulesSignature, result: AnalysisResult) -> None:
+        with self._lock:
+            if signature == self._signature:
+                self._cache[key] = copy.deepcopy(result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "invalidations": self.invalidations,
+                "size": len(self._cache),
+                "maxsize": self._cache.maxsize,
+            }
+
+
+analysis_cache = AnalysisCache(maxsize=ANALYSIS_CACHE_SIZE, ttl_seconds=ANALYSIS_CACHE_TTL_SECONDS)
+
+
+def analysis_key(title: str, summary: str, content: str, language_hint: Optional[str] = None) -> str:
     combined = clean_text(f"{title} {summary} {content}")
-    language = "unknown"
-    try:
-        language = detect(combined) if combined else "unknown"
-    except Exception:  # noqa: BLE001
-        language = "unknown"
+    return content_hash(f"{language_hint}:{combined}" if language_hint else combined)
+
+
+def analyze_item(
+    title: str, summary: str, content: str, language_hint: Optional[str] = None
+) -> AnalysisResult:
+    matcher = get_matcher()
+    key = analysis_key(title, summary, content, language_hint)
+    cached = analysis_cache.get(key, matcher.signature)
+    if cached is not None:
+        return cached
+    started = time.monotonic()
+    result = _analyze(AnalysisRequest(title, summary, content, language_hint), matcher)
+    analyze_seconds.observe(time.monotonic() - started)
+    analysis_cache.put(key, matcher.signature, result)
+    return result
+
+
+def _analyze(request: AnalysisRequest, matcher: RuleMatcher) -> AnalysisResult:
+    combined = clean_text(f"{request.title} {request.summary} {request.content}")
+    language = detect_language(combined, request.language_hint)
 
     entities = _extract_entities(combined)
-    topics = _match_rules(combined, TOPIC_RULES)
-    impacted = _match_rules(combined, SYMBOL_RULES)
+    hits = matcher.scan(combined)
+    topics = hits.topics
+    impacted = hits.symbols
+    triggers = hits.triggers
 
     direction = "uncertain"
     confidence = 40
@@ -82,32 +307,31 @@ def analyze_item(title: str, summary: str, content: str) -> AnalysisResult:
     scoring: Dict[str, Any] = {"rules": []}
     rationale = []
 
-    lowered = combined.lower()
-    if "risk-off" in lowered or "flight to safety" in lowered:
+    if "risk_off" in triggers:
         if "XAU/USD" in impacted:
             direction = "bullish"
             confidence += 20
             rationale.append("Risk-off language suggests safe-haven bid for gold.")
             scoring["rules"].append("risk_off_gold")
-    if "real yields" in lowered or "yields" in lowered:
+    if "yields" in triggers:
         if "XAU/USD" in impacted:
-            direction = "bearish" if "higher" in lowered else direction
+            direction = "bearish" if "higher" in triggers else direction
             confidence += 15
             rationale.append("Real yield commentary influences gold pricing.")
             scoring["rules"].append("real_yields_gold")
-    if "rate cut" in lowered or "dovish" in lowered:
+    if "dovish" in triggers:
         if "DXY" in impacted:
             direction = "bearish"
             confidence += 15
             rationale.append("Dovish policy tone weighs on USD.")
             scoring["rules"].append("dovish_usd")
-    if "rate hike" in lowered or "hawkish" in lowered:
+    if "hawkish" in triggers:
         if "DXY" in impacted:
             direction = "bullish"
             confidence += 15
             rationale.append("Hawkish policy tone supports USD.")
             scoring["rules"].append("hawkish_usd")
-    if "geopolitics" in lowered or "conflict" in lowered:
+    if "geo_risk" in triggers:
         if "XAU/USD" in impacted:
             direction = "bullish"
             confidence += 10
@@ -138,3 +362,80 @@ def analyze_item(title: str, summary: str, content: str) -> AnalysisResult:
         topics=topics,
         scoring={"language": language, **scoring},
     )
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _analyze_chunk(signature: RulesSignature, items: List[AnalysisRequest]) -> List[Tuple[AnalysisResult, float]]:
+    matcher = _matcher_for(signature)
+    timed = []
+    for item in items:
+        started = time.monotonic()
+        result = _analyze(item, matcher)
+        timed.append((result, time.monotonic() - started))
+    return timed
+
+
+def _observe_chunk(timed: List[Tuple[AnalysisResult, float]]) -> List[AnalysisResult]:
+    for _, elapsed in timed:
+        analyze_seconds.observe(elapsed)
+    return [result for result, _ in timed]
+
+
+def analyze_batch(items: Sequence[Tuple[Any, ...]], workers: Optional[int] = None) -> List[AnalysisResult]:
+    workers = ANALYSIS_WORKERS if workers is None else workers
+    signature = rules_signature()
+    requests = [AnalysisRequest(*item) for item in items]
+    results: List[Optional[AnalysisResult]] = []
+    misses: Dict[str, List[int]] = {}
+    for position, item in enumerate(requests):
+        key = analysis_key(*item)
+        cached = analysis_cache.get(key, signature) if key not in misses else None
+        results.append(cached)
+        if cached is None:
+            misses.setdefault(key, []).append(position)
+
+    keys = list(misses)
+    todo = [requests[misses[key][0]] for key in keys]
+    for key, result in zip(keys, _analyze_uncached(signature, todo, workers)):
+        analysis_cache.put(key, signature, result)
+        for position in misses[key]:
+            results[position] = result if position == misses[key][0] else copy.deepcopy(result)
+    return results  # type: ignore[return-value]
+
+
+def _analyze_uncached(
+    signature: RulesSignature, items: List[AnalysisRequest], workers: int
+) -> List[AnalysisResult]:
+    if workers <= 1 or len(items) < ANALYSIS_POOL_MIN_BATCH:
+        return _observe_chunk(_analyze_chunk(signature, items))
+
+    size = max(1, -(-len(items) // (workers * 4)))
+    chunks = [items[start : start + size] for start in range(0, len(items), size)]
+    try:
+        pool = _get_pool(workers)
+        results: List[AnalysisResult] = []
+        for chunk_results in pool.map(_analyze_chunk, [signature] * len(chunks), chunks):
+            results.extend(_observe_chunk(chunk_results))
+        return results
+    except BrokenProcessPool:
+        shutdown_pool()
+        return _observe_chunk(_analyze_chunk(signature, items))
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from langdetect import DetectorFactory, detect
+
+DetectorFactory.seed = 0
+
+LANGUAGE_SAMPLE_CHARS = int(os.getenv("LANGUAGE_SAMPLE_CHARS", "600"))
+
+_SCRIPT_LANGUAGES = [
+    (re.compile(r"[\u3040-\u30ff]"), "ja"),
+    (re.compile(r"[\uac00-\ud7af\u1100-\u11ff]"), "ko"),
+    (re.compile(r"[\u0370-\u03ff]"), "el"),
+    (re.compile(r"[\u0590-\u05ff]"), "he"),
+    (re.compile(r"[\u0e00-\u0e7f]"), "th"),
+]
+
+_ENGLISH_STOPWORDS = frozenset(
+    "the and of to for with that this from are were has have said by at as its be after over amid on "
+    "into than but not it their been would could".split()
+)
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+
+class LanguageDetector:
+    def __init__(self, sample_chars: int = LANGUAGE_SAMPLE_CHARS) -> None:
+        self.sample_chars = sample_chars
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def detect(self, text: str, hint: Optional[str] = None) -> str:
+        started = time.perf_counter()
+        tier, language = self._detect(text, hint)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            stats = self._stats.setdefault(tier, {"count": 0, "total_ms": 0.0})
+            stats["count"] += 1
+            stats["total_ms"] += elapsed * 1000
+        return language
+
+    def _detect(self, text: str, hint: Optional[str]) -> Tuple[str, str]:
+        if hint:
+            return "hint", hint
+        if not text:
+            return "empty", "unknown"
+        sample = text[: self.sample_chars]
+        if sample.isascii():
+            words = _WORD_RE.findall(sample.lower())
+            if len(words) >= 4 and sum(word in _ENGLISH_STOPWORDS for word in words) / len(words) >= 0.12:
+                return "ascii", "en"
+        else:
+            letters = sum(char.isalpha() for char in sample) or 1
+            for pattern, language in _SCRIPT_LANGUAGES:
+                if len(pattern.findall(sample)) / letters >= 0.3:
+                    return "script", language
+        try:
+            return "full", detect(sample)
+        except Exception:  # noqa: BLE001
+            return "full", "unknown"
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                tier: {
+                    "count": int(values["count"]),
+                    "total_ms": round(values["total_ms"], 2),
+                    "avg_ms": round(values["total_ms"] / values["count"], 3),
+                }
+                for tier, values in self._stats.items()
+            }
+
+
+language_detector = LanguageDetector()
+
+
+def detect_language(text: str, hint: Optional[str] = None) -> str:
+    return language_detector.detect(text, hint)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from .models import IngestState, Lease
+
+INGEST_LEASE_SECONDS = float(os.getenv("INGEST_LEASE_SECONDS", "60"))
+
+SessionFactory = Callable[[], Session]
+
+
+class LeaderLease:
+    def __init__(self, name: str, ttl_seconds: float = INGEST_LEASE_SECONDS, holder: Optional[str] = None) -> None:
+        self.name = name
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.holder = holder or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.held = False
+
+    def acquire(self, session_factory: SessionFactory) -> bool:
+        now = datetime.utcnow()
+        session = session_factory()
+        try:
+            updated = (
+                session.query(Lease)
+                .filter(Lease.name == self.name, or_(Lease.holder == self.holder, Lease.expires_at < now))
+                .update({Lease.holder: self.holder, Lease.expires_at: now + self.ttl}, synchronize_session=False)
+            )
+            if not updated:
+                session.add(Lease(name=self.name, holder=self.holder, expires_at=now + self.ttl))
+            session.commit()
+            self.held = True
+        except SQLAlchemyError:
+            session.rollback()
+            self.held = False
+        finally:
+            session.close()
+        return self.held
+
+    def release(self, session_factory: SessionFactory) -> None:
+        if not self.held:
+            return
+        session = session_factory()
+        try:
+            session.query(Lease).filter(Lease.name == self.name, Lease.holder == self.holder).update(
+                {Lease.expires_at: datetime.utcnow()}, synchronize_session=False
+            )
+            session.commit()
+        finally:
+            session.close()
+            self.held = False
+
+
+def current_leader(session: Session, name: str) -> Optional[Dict[str, Any]]:
+    lease = session.get(Lease, name)
+    if lease is None:
+        return None
+    return {
+        "holder": lease.holder,
+        "expires_at": lease.expires_at.isoformat(),
+        "active": lease.expires_at > datetime.utcnow(),
+    }
+
+
+def store_state(session: Session, values: Dict[str, Dict[str, Any]]) -> None:
+    now = datetime.utcnow()
+    for key, value in values.items():
+        session.merge(IngestState(key=key, value_json=json.dumps(value), updated_at=now))
+    session.commit()
+
+
+def load_state(session: Session, prefix: str) -> Dict[str, Dict[str, Any]]:
+    rows = session.query(IngestState.key, IngestState.value_json).filter(IngestState.key.startswith(prefix))
+    return {key[len(prefix) :]: json.loads(value_json) for key, value_json in rows}
+
+
+def load_value(session: Session, key: str) -> Dict[str, Any]:
+    row = session.get(IngestState, key)
+    return json.loads(row.value_json) if row is not None else {}
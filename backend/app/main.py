@@ -1,16 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 import json
-from datetime import datetime
-from typing import Any, List, Optional
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Tuple
 
-from fastapi import Depends, FastAPI, HTTPException
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from fastapi import Depends, FastAPI, Header, HTTPException
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import func, or_, tuple_
+from sqlalchemy.orm import Session, contains_eager, joinedload
 
+from .alerts import alert_index
+from .analysis.engine import shutdown_pool
+from .coordination import current_leader, load_state, load_value
 from .db import SessionLocal, init_db
-from .models import Alert, AlertEvent, Analysis, NewsItem, Source
-from .scheduler import SOURCE_STATUS, start_scheduler
+from .metrics import CONTENT_TYPE, registry
+from .models import Alert, AlertEvent, Analysis, NewsItem, NewsSymbol, Source
+from .payloads import payload_cache
+from .scheduler import INGEST_IN_API, ingest_lease, ingest_pipeline, start_scheduler
 from .schemas import (
     AlertCreate,
     AlertEventOut,
@@ -19,10 +26,14 @@ from .schemas import (
     SourceCreate,
     SourceOut,
 )
-from .sse import event_hub
+from .sources.html import page_cache
+from .sse import SSE_RELAY_SECONDS, StreamFilter, event_hub
+from .utils.http import host_registry
 
 app = FastAPI(title="Forex News Impact Tracker")
 
+MAX_PAGE_SIZE = 500
+
 
 def get_db() -> Session:
     db = SessionLocal()
@@ -36,7 +47,30 @@ def get_db() -> Session:
 def startup() -> None:
     init_db()
     _seed_sources()
-    start_scheduler()
+    if INGEST_IN_API:
+        start_scheduler()
+
+
+@app.on_event("startup")
+async def bind_event_hub() -> None:
+    event_hub.bind(asyncio.get_running_loop())
+
+
+@app.on_event("startup")
+async def start_event_relay() -> None:
+    if SSE_RELAY_SECONDS <= 0:
+        return
+    event_hub.last_id = await asyncio.to_thread(_latest_news_id)
+    app.state.event_relay = asyncio.get_running_loop().create_task(event_hub.relay(_stream_backfill, SSE_RELAY_SECONDS))
+
+
+@app.on_event("shutdown")
+def shutdown() -> None:
+    ingest_pipeline.stop()
+    ingest_lease.release(SessionLocal)
+    shutdown_pool()
+    page_cache.close()
+    host_registry.close()
 
 
 @app.get("/api/news", response_model=List[NewsOut])
@@ -44,33 +78,63 @@ def list_news(
     symbol: Optional[str] = None,
     source: Optional[str] = None,
     min_confidence: int = 0,
+    limit: int = 100,
+    before_id: Optional[int] = None,
+    before_fetched_at: Optional[datetime] = None,
     db: Session = Depends(get_db),
-) -> List[NewsOut]:
-    query = db.query(NewsItem).join(Source).outerjoin(Analysis)
+) -> Response:
+    query = (
+        db.query(NewsItem)
+        .join(Source)
+        .outerjoin(Analysis)
+        .options(contains_eager(NewsItem.source), contains_eager(NewsItem.analysis))
+    )
+    order_columns = (NewsItem.fetched_at, NewsItem.id)
+    if symbol:
+        query = query.join(NewsSymbol, NewsSymbol.news_item_id == NewsItem.id).filter(NewsSymbol.symbol == symbol)
+        order_columns = (NewsSymbol.fetched_at, NewsSymbol.news_item_id)
     if source:
         query = query.filter(Source.name == source)
-    items = query.order_by(NewsItem.fetched_at.desc()).limit(100).all()
-    output = []
-    for item in items:
-        analysis = item.analysis
-        if analysis and min_confidence and analysis.confidence < min_confidence:
-            continue
-        if analysis and symbol and symbol not in json.loads(analysis.impacted_symbols_json):
-            continue
-        output.append(_serialize_news(item))
-    return output
+    if min_confidence:
+        query = query.filter(or_(Analysis.id.is_(None), Analysis.confidence >= min_confidence))
+    if before_id is not None and before_fetched_at is None:
+        before_fetched_at = db.query(NewsItem.fetched_at).filter(NewsItem.id == before_id).scalar()
+    if before_fetched_at is not None:
+        if before_fetched_at.tzinfo is not None:
+            before_fetched_at = before_fetched_at.astimezone(timezone.utc).replace(tzinfo=None)
+        if before_id is not None:
+            query = query.filter(tuple_(*order_columns) < tuple_(before_fetched_at, before_id))
+        else:
+            query = query.filter(order_columns[0] < before_fetched_at)
+    elif before_id is not None:
+        # The cursor row is gone (pruned or never existed); ids still only move forward, so keep paging by id.
+        query = query.filter(order_columns[1] < before_id)
+    items = (
+        query.order_by(*(column.desc() for column in order_columns))
+        .limit(max(1, min(limit, MAX_PAGE_SIZE)))
+        .all()
+    )
+    return Response(content=payload_cache.encode_list(items), media_type="application/json")
 
 
 @app.get("/api/news/{news_id}", response_model=NewsOut)
-def get_news(news_id: int, db: Session = Depends(get_db)) -> NewsOut:
-    item = db.query(NewsItem).filter(NewsItem.id == news_id).first()
-    if not item:
-        raise HTTPException(status_code=404, detail="News item not found")
-    return _serialize_news(item)
+def get_news(news_id: int, db: Session = Depends(get_db)) -> Response:
+    body = payload_cache.get(news_id)
+    if body is None:
+        item = (
+            db.query(NewsItem)
+            .options(joinedload(NewsItem.source), joinedload(NewsItem.analysis))
+            .filter(NewsItem.id == news_id)
+            .first()
+        )
+        if not item:
+            raise HTTPException(status_code=404, detail="News item not found")
+        body = payload_cache.encode(item)
+    return Response(content=body, media_type="application/json")
 
 
 @app.get("/api/analysis/latest", response_model=List[NewsOut])
-def latest_analysis(symbol: Optional[str] = None, db: Session = Depends(get_db)) -> List[NewsOut]:
+def latest_analysis(symbol: Optional[str] = None, db: Session = Depends(get_db)) -> Response:
     return list_news(symbol=symbol, db=db)
 
 
@@ -123,6 +187,7 @@ def create_alert(payload: AlertCreate, db: Session = Depends(get_db)) -> AlertOu
     db.add(alert)
     db.commit()
     db.refresh(alert)
+    alert_index.invalidate()
     return AlertOut(id=alert.id, name=alert.name, rule=payload.rule, enabled=alert.enabled, created_at=alert.created_at)
 
 
@@ -144,13 +209,43 @@ def alerts_history(db: Session = Depends(get_db)) -> List[AlertEventOut]:
 
 
 @app.get("/api/sources/status")
-def sources_status() -> dict[str, Any]:
-    return SOURCE_STATUS
+def sources_status(db: Session = Depends(get_db)) -> dict[str, Any]:
+    return load_state(db, "source:")
+
+
+@app.get("/api/sources/cycle")
+def sources_cycle(db: Session = Depends(get_db)) -> dict[str, Any]:
+    cycle = load_value(db, "cycle")
+    if ingest_lease.held:
+        cycle["pipeline"] = ingest_pipeline.stats()
+    return {**cycle, "leader": current_leader(db, ingest_lease.name)}
 
 
 @app.get("/api/stream")
-async def stream() -> StreamingResponse:
-    return StreamingResponse(event_hub.subscribe(), media_type="text/event-stream")
+async def stream(
+    symbol: Optional[str] = None,
+    source: Optional[str] = None,
+    min_confidence: int = 0,
+    direction: Optional[str] = None,
+    last_event_id: Optional[int] = None,
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+) -> StreamingResponse:
+    if last_event_id_header and last_event_id_header.isdigit():
+        last_event_id = int(last_event_id_header)
+    return StreamingResponse(
+        event_hub.subscribe(
+            last_event_id=last_event_id,
+            backfill=_stream_backfill,
+            stream_filter=StreamFilter(symbol or None, source or None, min_confidence, direction or None),
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/metrics")
+def metrics() -> Response:
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
 
 
 @app.get("/healthz")
@@ -158,32 +253,28 @@ def healthz() -> dict[str, str]:
     return {"status": "ok", "time": datetime.utcnow().isoformat()}
 
 
-def _serialize_news(item: NewsItem) -> NewsOut:
-    analysis = None
-    if item.analysis:
-        analysis = {
-            "impacted_symbols": json.loads(item.analysis.impacted_symbols_json),
-            "direction": item.analysis.direction,
-            "confidence": item.analysis.confidence,
-            "horizon": item.analysis.horizon,
-            "rationale": json.loads(item.analysis.rationale_json),
-            "tags": json.loads(item.analysis.tags_json),
-            "entities": json.loads(item.analysis.entities_json or "[]"),
-            "topics": json.loads(item.analysis.topics_json or "[]"),
-            "scoring": json.loads(item.analysis.scoring_json or "{}"),
-        }
-    return NewsOut(
-        id=item.id,
-        source=item.source.name if item.source else "",
-        url=item.url,
-        title=item.title,
-        summary=item.summary,
-        content=item.content,
-        published_at=item.published_at,
-        fetched_at=item.fetched_at,
-        language=item.language,
-        analysis=analysis,
-    )
+def _stream_backfill(after_id: int, limit: int) -> List[Tuple[int, bytes]]:
+    session = SessionLocal()
+    try:
+        items = (
+            session.query(NewsItem)
+            .options(joinedload(NewsItem.source), joinedload(NewsItem.analysis))
+            .filter(NewsItem.id > after_id)
+            .order_by(NewsItem.id)
+            .limit(limit)
+            .all()
+        )
+        return [(item.id, payload_cache.encode(item)) for item in items]
+    finally:
+        session.close()
+
+
+def _latest_news_id() -> int:
+    session = SessionLocal()
+    try:
+        return session.query(func.max(NewsItem.id)).scalar() or 0
+    finally:
+        session.close()
 
 
 def _seed_sources() -> None:
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime
+from typing import Callable, List, Sequence, Tuple
+
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, String, Table, func, inspect, select
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+HOT_LOOKUP_INDEXES: List[Tuple[str, str, Tuple[str, ...], bool]] = [
+    ("ix_sources_name", "sources", ("name",), False),
+    ("ix_news_items_url", "news_items", ("url",), True),
+    ("ix_news_items_hash", "news_items", ("hash",), True),
+    ("ix_news_items_fetched_at", "news_items", ("fetched_at",), False),
+    ("ix_news_items_source_id_fetched_at", "news_items", ("source_id", "fetched_at"), False),
+    ("ix_analyses_news_item_id", "analyses", ("news_item_id",), True),
+    ("ix_alert_events_news_item_id", "alert_events", ("news_item_id",), False),
+    ("ix_alert_events_triggered_at", "alert_events", ("triggered_at",), False),
+    ("ix_alert_events_alert_id_triggered_at", "alert_events", ("alert_id", "triggered_at"), False),
+]
+
+NEWS_ITEM_DEPENDENTS = ("analyses", "alert_events", "news_symbols")
+
+
+def _create_hot_lookup_indexes(engine: Engine) -> None:
+    for name, table_name, columns, unique in HOT_LOOKUP_INDEXES:
+        with engine.begin() as connection:
+            existing = {index["name"]: index["unique"] for index in inspect(connection).get_indexes(table_name)}
+            if name in existing and (bool(existing[name]) or not unique):
+                continue
+            table = Table(table_name, MetaData(), autoload_with=connection)
+            if name in existing:
+                Index(name, *(table.c[column] for column in columns)).drop(connection)
+            if unique:
+                removed = _remove_duplicates(connection, table, columns)
+                if removed:
+                    logger.warning("Removed %d %s rows with duplicate %s", removed, table_name, ", ".join(columns))
+            Index(name, *(table.c[column] for column in columns), unique=unique).create(connection)
+
+
+def _remove_duplicates(connection: Connection, table: Table, columns: Sequence[str]) -> int:
+    keep = select(func.min(table.c.id)).group_by(*(table.c[column] for column in columns))
+    doomed = select(table.c.id).where(table.c.id.not_in(keep))
+    if table.name == "news_items":
+        present = set(inspect(connection).get_table_names())
+        for dependent_name in NEWS_ITEM_DEPENDENTS:
+            if dependent_name in present:
+                dependent = Table(dependent_name, MetaData(), autoload_with=connection)
+                connection.execute(dependent.delete().where(dependent.c.news_item_id.in_(doomed)))
+    return connection.execute(table.delete().where(table.c.id.in_(doomed))).rowcount
+
+
+def _backfill_news_symbols(engine: Engine) -> None:
+    from .models import Analysis, NewsItem, NewsSymbol
+
+    last_id = 0
+    while True:
+        with engine.begin() as connection:
+            batch = connection.execute(
+                select(NewsItem.id, NewsItem.fetched_at, Analysis.impacted_symbols_json)
+                .join(Analysis, Analysis.news_item_id == NewsItem.id)
+                .where(NewsItem.id > last_id, NewsItem.id.not_in(select(NewsSymbol.news_item_id)))
+                .order_by(NewsItem.id)
+                .limit(5000)
+            ).all()
+            if not batch:
+                return
+            rows = [
+                {"news_item_id": news_item_id, "symbol": symbol, "fetched_at": fetched_at}
+                for news_item_id, fetched_at, symbols_json in batch
+                for symbol in json.loads(symbols_json or "[]")
+            ]
+            if rows:
+                connection.execute(NewsSymbol.__table__.insert(), rows)
+            last_id = batch[-1][0]
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[Engine], None]]] = [
+    (1, "hot_lookup_indexes", _create_hot_lookup_indexes),
+    (2, "news_symbols_backfill", _backfill_news_symbols),
+    (3, "unique_lookup_indexes", _create_hot_lookup_indexes),
+]
+
+
+def run_migrations(engine: Engine) -> List[int]:
+    _metadata.create_all(bind=engine)
+    with engine.connect() as connection:
+        applied = set(connection.execute(select(schema_migrations.c.version)).scalars())
+    ran = []
+    for version, name, migrate in MIGRATIONS:
+        if version in applied:
+            continue
+        logger.info("Applying migration %s (%s)", version, name)
+        migrate(engine)
+        with engine.begin() as connection:
+            connection.execute(
+                schema_migrations.insert().values(version=version, name=name, applied_at=datetime.utcnow())
+            )
+        ran.append(version)
+    return ran
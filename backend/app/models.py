@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 
 from .db import Base
@@ -11,7 +11,7 @@ class Source(Base):
     __tablename__ = "sources"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, nullable=False)
+    name = Column(String, nullable=False, index=True)
     type = Column(String, nullable=False)
     config_json = Column(Text, nullable=False)
     enabled = Column(Boolean, default=True)
@@ -24,24 +24,27 @@ class NewsItem(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     source_id = Column(Integer, ForeignKey("sources.id"), nullable=False)
-    url = Column(String, nullable=False)
+    url = Column(String, nullable=False, unique=True, index=True)
     title = Column(String, nullable=False)
     summary = Column(Text, nullable=True)
     content = Column(Text, nullable=True)
     published_at = Column(DateTime, nullable=True)
-    fetched_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    hash = Column(String, nullable=False)
+    fetched_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    hash = Column(String, nullable=False, unique=True, index=True)
     language = Column(String, nullable=True)
 
+    __table_args__ = (Index("ix_news_items_source_id_fetched_at", "source_id", "fetched_at"),)
+
     source = relationship("Source", back_populates="news_items")
     analysis = relationship("Analysis", back_populates="news_item", uselist=False)
+    symbols = relationship("NewsSymbol", back_populates="news_item")
 
 
 class Analysis(Base):
     __tablename__ = "analyses"
 
     id = Column(Integer, primary_key=True, index=True)
-    news_item_id = Column(Integer, ForeignKey("news_items.id"), nullable=False)
+    news_item_id = Column(Integer, ForeignKey("news_items.id"), nullable=False, unique=True, index=True)
     impacted_symbols_json = Column(Text, nullable=False)
     direction = Column(String, nullable=False)
     confidence = Column(Integer, nullable=False)
@@ -56,6 +59,19 @@ class Analysis(Base):
     news_item = relationship("NewsItem", back_populates="analysis")
 
 
+class NewsSymbol(Base):
+    __tablename__ = "news_symbols"
+
+    id = Column(Integer, primary_key=True, index=True)
+    news_item_id = Column(Integer, ForeignKey("news_items.id"), nullable=False, index=True)
+    symbol = Column(String, nullable=False)
+    fetched_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (Index("ix_news_symbols_symbol_fetched_at", "symbol", "fetched_at", "news_item_id"),)
+
+    news_item = relationship("NewsItem", back_populates="symbols")
+
+
 class Alert(Base):
     __tablename__ = "alerts"
 
@@ -71,6 +87,32 @@ class AlertEvent(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     alert_id = Column(Integer, ForeignKey("alerts.id"), nullable=False)
-    news_item_id = Column(Integer, ForeignKey("news_items.id"), nullable=False)
-    triggered_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    news_item_id = Column(Integer, ForeignKey("news_items.id"), nullable=False, index=True)
+    triggered_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
     payload_json = Column(Text, nullable=False)
+
+    __table_args__ = (Index("ix_alert_events_alert_id_triggered_at", "alert_id", "triggered_at"),)
+
+
+class RobotsTxt(Base):
+    __tablename__ = "robots_txt"
+
+    domain = Column(String, primary_key=True)
+    body = Column(Text, nullable=False, default="")
+    fetched_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class Lease(Base):
+    __tablename__ = "leases"
+
+    name = Column(String, primary_key=True)
+    holder = Column(String, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+
+class IngestState(Base):
+    __tablename__ = "ingest_state"
+
+    key = Column(String, primary_key=True)
+    value_json = Column(Text, nullable=False, default="{}")
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
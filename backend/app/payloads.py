@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from cachetools import LRUCache
+
+from .models import Analysis, NewsItem
+
+NEWS_PAYLOAD_CACHE_SIZE = int(os.getenv("NEWS_PAYLOAD_CACHE_SIZE", "5000"))
+
+
+def analysis_payload(analysis: Any) -> Dict[str, Any]:
+    return {
+        "impacted_symbols": analysis.impacted_symbols,
+        "direction": analysis.direction,
+        "confidence": analysis.confidence,
+        "horizon": analysis.horizon,
+        "rationale": analysis.rationale,
+        "tags": analysis.tags,
+        "entities": analysis.entities,
+        "topics": analysis.topics,
+        "scoring": analysis.scoring,
+    }
+
+
+def analysis_row_payload(row: Analysis) -> Dict[str, Any]:
+    return {
+        "impacted_symbols": json.loads(row.impacted_symbols_json),
+        "direction": row.direction,
+        "confidence": row.confidence,
+        "horizon": row.horizon,
+        "rationale": json.loads(row.rationale_json),
+        "tags": json.loads(row.tags_json),
+        "entities": json.loads(row.entities_json or "[]"),
+        "topics": json.loads(row.topics_json or "[]"),
+        "scoring": json.loads(row.scoring_json or "{}"),
+    }
+
+
+def news_payload(news: NewsItem, source_name: str, analysis: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "id": news.id,
+        "source": source_name,
+        "url": news.url,
+        "title": news.title,
+        "summary": news.summary,
+        "content": news.content,
+        "published_at": news.published_at.isoformat() if news.published_at else None,
+        "fetched_at": news.fetched_at.isoformat(),
+        "language": news.language,
+        "analysis": analysis,
+    }
+
+
+def news_row_payload(news: NewsItem) -> Dict[str, Any]:
+    analysis = analysis_row_payload(news.analysis) if news.analysis else None
+    return news_payload(news, news.source.name if news.source else "", analysis)
+
+
+def encode_payload(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class PayloadCache:
+    def __init__(self, maxsize: int) -> None:
+        self._entries: LRUCache = LRUCache(maxsize=max(1, maxsize))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, news_id: int) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(news_id)
+            if body is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return body
+
+    def put(self, news_id: int, body: bytes) -> None:
+        with self._lock:
+            self._entries[news_id] = body
+
+    def encode(self, news: NewsItem) -> bytes:
+        body = self.get(news.id)
+        if body is None:
+            body = encode_payload(news_row_payload(news))
+            self.put(news.id, body)
+        return body
+
+    def encode_list(self, items: Iterable[NewsItem]) -> bytes:
+        return b"[" + b",".join(self.encode(item) for item in items) + b"]"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+payload_cache = PayloadCache(NEWS_PAYLOAD_CACHE_SIZE)
+
+
+def prime_payloads(payloads: List[Dict[str, Any]]) -> None:
+    for payload in payloads:
+        payload_cache.put(payload["id"], encode_payload(payload))
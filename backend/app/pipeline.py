@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "1000"))
+STAGE_RATE_WINDOW_SECONDS = 60.0
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[List[Any]], None]
+
+_STOP = object()
+
+
+class Stage:
+    def __init__(
+        self,
+        name: str,
+        handler: Handler,
+        workers: int = 1,
+        capacity: int = INGEST_QUEUE_SIZE,
+        batch_size: int = 1,
+        on_error: Optional[Handler] = None,
+    ) -> None:
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.capacity = max(1, capacity)
+        self.batch_size = max(1, batch_size)
+        self.on_error = on_error
+        self.queue: queue.Queue = queue.Queue(maxsize=self.capacity)
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._completions: Deque[Tuple[float, int]] = deque()
+        self.processed = 0
+        self.failed = 0
+        self.batches = 0
+        self.busy_seconds = 0.0
+        self.last_error: Optional[str] = None
+
+    def start(self) -> None:
+        with self._lock:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            for index in range(len(self._threads), self.workers):
+                thread = threading.Thread(target=self._run, name=f"ingest-{self.name}-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def put(self, entry: Any, block: bool = True) -> None:
+        self.queue.put(entry, block=block)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            try:
+                self.queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                break
+        for thread in threads:
+            thread.join(timeout)
+
+    def _take(self) -> List[Any]:
+        batch = [self.queue.get()]
+        while len(batch) < self.batch_size and batch[-1] is not _STOP:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take()
+            stop = batch[-1] is _STOP
+            if stop:
+                batch.pop()
+            if batch:
+                self._process(batch)
+            if stop:
+                return
+
+    def _process(self, batch: List[Any]) -> None:
+        started = time.monotonic()
+        failed = False
+        try:
+            self.handler(batch)
+        except Exception as exc:  # noqa: BLE001
+            failed = True
+            logger.exception("Ingest stage %s failed on %d entries", self.name, len(batch))
+            self.last_error = str(exc)
+            if self.on_error is not None:
+                self.on_error(batch)
+        finished = time.monotonic()
+        with self._lock:
+            self.batches += 1
+            self.busy_seconds += finished - started
+            if failed:
+                self.failed += len(batch)
+            else:
+                self.processed += len(batch)
+                self._completions.append((finished, len(batch)))
+
+    def stats(self) -> Dict[str, Any]:
+        cutoff = time.monotonic() - STAGE_RATE_WINDOW_SECONDS
+        with self._lock:
+            while self._completions and self._completions[0][0] < cutoff:
+                self._completions.popleft()
+            recent = sum(count for _, count in self._completions)
+            return {
+                "workers": self.workers,
+                "depth": self.queue.qsize(),
+                "capacity": self.capacity,
+                "processed": self.processed,
+                "failed": self.failed,
+                "batches": self.batches,
+                "busy_ms": round(self.busy_seconds * 1000, 1),
+                "rate_per_s": round(recent / STAGE_RATE_WINDOW_SECONDS, 2),
+                "last_error": self.last_error,
+            }
+
+
+class Pipeline:
+    def __init__(self, stages: List[Stage]) -> None:
+        self.stages = {stage.name: stage for stage in stages}
+
+    def __getitem__(self, name: str) -> Stage:
+        return self.stages[name]
+
+    def start(self) -> None:
+        for stage in self.stages.values():
+            stage.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        for stage in self.stages.values():
+            stage.stop(timeout)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stage.stats() for name, stage in self.stages.items()}
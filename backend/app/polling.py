@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import os
+import random
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Set
+
+POLL_TICK_SECONDS = float(os.getenv("POLL_TICK_SECONDS", "15"))
+POLL_MIN_SECONDS = float(os.getenv("POLL_MIN_SECONDS", "60"))
+POLL_MAX_SECONDS = float(os.getenv("POLL_MAX_SECONDS", "1800"))
+POLL_JITTER = 0.1
+
+
+@dataclass
+class PollSchedule:
+    min_interval: float
+    max_interval: float
+    interval: float
+    next_poll: datetime
+    failures: int = 0
+    last_new_items: int = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "interval_seconds": round(self.interval, 1),
+            "next_poll": self.next_poll.isoformat(),
+            "failures": self.failures,
+        }
+
+
+class PollPlanner:
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        self._schedules: Dict[int, PollSchedule] = {}
+        self._lock = threading.Lock()
+        self._rng = rng or random.Random()
+
+    def schedule(self, source_id: int, config: Dict[str, Any], now: Optional[datetime] = None) -> PollSchedule:
+        min_interval = float(config.get("poll_min_seconds", POLL_MIN_SECONDS))
+        max_interval = max(min_interval, float(config.get("poll_max_seconds", POLL_MAX_SECONDS)))
+        with self._lock:
+            schedule = self._schedules.get(source_id)
+            if schedule is None:
+                schedule = self._schedules[source_id] = PollSchedule(
+                    min_interval, max_interval, min_interval, now or datetime.utcnow()
+                )
+            schedule.min_interval, schedule.max_interval = min_interval, max_interval
+            schedule.interval = min(max(schedule.interval, min_interval), max_interval)
+            return schedule
+
+    def due(self, source_id: int, config: Dict[str, Any], now: Optional[datetime] = None) -> bool:
+        now = now or datetime.utcnow()
+        return self.schedule(source_id, config, now).next_poll <= now
+
+    def record(
+        self, source_id: int, config: Dict[str, Any], ok: bool, new_items: int, now: Optional[datetime] = None
+    ) -> PollSchedule:
+        now = now or datetime.utcnow()
+        schedule = self.schedule(source_id, config, now)
+        with self._lock:
+            if ok:
+                schedule.failures = 0
+                schedule.last_new_items = new_items
+                if new_items:
+                    schedule.interval = max(schedule.min_interval, schedule.interval / 2)
+                else:
+                    schedule.interval = min(schedule.max_interval, schedule.interval * 1.5)
+                delay = schedule.interval * self._rng.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+            else:
+                schedule.failures += 1
+                backoff = min(schedule.max_interval, schedule.min_interval * 2 ** min(schedule.failures, 32))
+                delay = self._rng.uniform(backoff / 2, backoff)
+            schedule.next_poll = now + timedelta(seconds=min(delay, schedule.max_interval))
+            return schedule
+
+    def source_ids(self) -> Set[int]:
+        with self._lock:
+            return set(self._schedules)
+
+    def forget(self, source_id: int) -> None:
+        with self._lock:
+            self._schedules.pop(source_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._schedules.clear()
+
+
+poll_planner = PollPlanner()
@@ -1,22 +1,97 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+import requests
 from apscheduler.schedulers.background import BackgroundScheduler
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
 
-from .analysis.engine import analyze_item
+from .alerts import alert_index
+from .analysis.engine import AnalysisResult, analysis_cache, analyze_batch
+from .analysis.language import language_detector
+from .coordination import LeaderLease, store_state
 from .db import SessionLocal
-from .models import Analysis, Alert, AlertEvent, NewsItem, Source
+from .metrics import (
+    alerts_fired,
+    commit_seconds,
+    dedupe_seconds,
+    duplicates_dropped,
+    fetch_seconds,
+    items_fetched,
+    registry,
+)
+from .models import Analysis, AlertEvent, NewsItem, NewsSymbol, Source
+from .payloads import analysis_payload, news_payload, payload_cache, prime_payloads
+from .pipeline import Pipeline, Stage
+from .polling import POLL_TICK_SECONDS, poll_planner
 from .sources.demo import DemoReplay
-from .sources.html import HtmlFetcher
-from .sources.rss import fetch_rss
+from .sources.html import HtmlFetcher, page_cache
+from .sources.rss import FeedUpdate, feed_cache, read_rss
 from .sse import event_hub
-from .utils.dedupe import compute_dedupe, is_duplicate
+from .utils.dedupe import DedupeIndex, compute_dedupe, duplicate_reason
+from .utils.http import host_registry
+
+FETCH_MAX_WORKERS = int(os.getenv("FETCH_MAX_WORKERS", "8"))
+FETCH_TIMEOUT_SECONDS = float(os.getenv("FETCH_TIMEOUT_SECONDS", "20"))
+FETCH_CYCLE_TIMEOUT_SECONDS = float(os.getenv("FETCH_CYCLE_TIMEOUT_SECONDS", "50"))
+DEDUPE_WINDOW_HOURS = float(os.getenv("DEDUPE_WINDOW_HOURS", "0"))
+INGEST_ANALYZE_WORKERS = int(os.getenv("INGEST_ANALYZE_WORKERS", "2"))
+INGEST_ANALYZE_CHUNK = int(os.getenv("INGEST_ANALYZE_CHUNK", "32"))
+INGEST_WRITE_BATCH = int(os.getenv("INGEST_WRITE_BATCH", "500"))
+INGEST_IN_API = os.getenv("INGEST_IN_API", "true").lower() in ("1", "true", "yes")
 
 SOURCE_STATUS: Dict[int, Dict[str, Any]] = {}
+CYCLE_STATUS: Dict[str, Any] = {}
+
+ingest_lease = LeaderLease("ingest")
+
+dedupe_index = DedupeIndex(window=timedelta(hours=DEDUPE_WINDOW_HOURS) if DEDUPE_WINDOW_HOURS > 0 else None)
+
+_in_flight: Set[int] = set()
+_in_flight_lock = threading.Lock()
+
+
+@dataclass
+class FetchJob:
+    source_id: int
+    name: str
+    type: str
+    config: Dict[str, Any]
+    timeout: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    feed_update: Optional[FeedUpdate] = None
+
+    def __post_init__(self) -> None:
+        self._chunks = 0
+        self._failed = False
+        self._lock = threading.Lock()
+
+    def expect(self, chunks: int, ok: bool) -> None:
+        with self._lock:
+            self._chunks = chunks
+        self.settle(ok, chunks=0)
+
+    def settle(self, ok: bool = True, chunks: int = 1) -> None:
+        # Feed validators and seen keys are only saved once every chunk from this fetch is written, so a
+        # timeout or a dropped chunk leaves the old state and the next poll fetches those entries again.
+        with self._lock:
+            self._chunks -= chunks
+            self._failed = self._failed or not ok
+            update = None
+            if self._chunks == 0 and not self._failed:
+                update, self.feed_update = self.feed_update, None
+        if update is not None:
+            feed_cache.commit(update)
 
 
 def _load_demo() -> DemoReplay:
@@ -24,162 +99,453 @@ def _load_demo() -> DemoReplay:
     return DemoReplay(data_path)
 
 
-def fetch_sources() -> None:
+def warm_dedupe_index(session: Session) -> None:
+    dedupe_index.clear()
+    query = session.query(NewsItem.url, NewsItem.hash, NewsItem.title, NewsItem.fetched_at)
+    if dedupe_index.window is not None:
+        query = query.filter(NewsItem.fetched_at >= datetime.utcnow() - dedupe_index.window)
+    dedupe_index.load(query.order_by(NewsItem.fetched_at).yield_per(5000))
+
+
+def _fetch_items(job: FetchJob, demo: Optional[DemoReplay]) -> List[dict[str, Any]]:
+    if job.type == "rss":
+        items, job.feed_update = read_rss(
+            job.config["url"], timeout=job.timeout, incremental=job.config.get("incremental", True)
+        )
+        return items
+    if job.type == "html":
+        fetcher = HtmlFetcher(min_interval=job.config.get("min_interval", 2.0))
+        return fetcher.fetch(job.config["url"], timeout=job.timeout)
+    if job.type == "demo" and demo is not None:
+        return demo.next_batch(batch_size=1)
+    raise ValueError("Unknown source type")
+
+
+def _run_job(job: FetchJob, demo: Optional[DemoReplay] = None) -> List[dict[str, Any]]:
+    job.started_at = time.monotonic()
+    try:
+        return _fetch_items(job, demo)
+    finally:
+        job.finished_at = time.monotonic()
+        fetch_seconds.observe(job.finished_at - job.started_at, source=job.name)
+
+
+def _job_status(job: FetchJob, ok: bool = True, error: Optional[str] = None) -> Dict[str, Any]:
+    duration = 0.0
+    if job.started_at is not None:
+        duration = (job.finished_at or time.monotonic()) - job.started_at
+    status = {
+        "last_fetch": datetime.utcnow().isoformat(),
+        "ok": ok,
+        "error": error,
+        "duration_ms": round(duration * 1000, 1),
+    }
+    if job.type == "rss" and "url" in job.config:
+        status["conditional"] = feed_cache.state(job.config["url"]).stats()
+    return status
+
+
+def _fetch_one(job: FetchJob) -> Tuple[List[dict[str, Any]], Dict[str, Any]]:
+    try:
+        items = _run_job(job, _load_demo() if job.type == "demo" else None)
+    except requests.Timeout:
+        return [], _job_status(job, ok=False, error=f"Timed out after {job.timeout:g}s")
+    except Exception as exc:  # noqa: BLE001
+        return [], _job_status(job, ok=False, error=str(exc))
+    items_fetched.inc(len(items), source=job.name)
+    return items, _job_status(job)
+
+
+@dataclass
+class PendingItem:
+    source_id: int
+    source_name: str
+    url: str
+    hash: str
+    title: str
+    summary: str
+    content: str
+    published_at: Optional[datetime]
+    language_hint: Optional[str] = None
+    received_at: float = field(default_factory=time.time)
+
+
+def _parse_published(value: Any) -> Optional[datetime]:
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return value
+
+
+def _collect(job: FetchJob, items: List[dict[str, Any]]) -> List[PendingItem]:
+    pending = []
+    for item in items:
+        title = item.get("title", "")
+        content = item.get("content", "")
+        started = time.monotonic()
+        dedupe_result = compute_dedupe(title, content, dedupe_index.titles, item.get("url", ""))
+        reason = duplicate_reason(dedupe_result, dedupe_index.urls, dedupe_index.hashes)
+        dedupe_seconds.observe(time.monotonic() - started)
+        if reason is not None:
+            duplicates_dropped.inc(reason=reason)
+            continue
+        dedupe_index.add(dedupe_result.canonical_url, dedupe_result.hash_value, title)
+        pending.append(
+            PendingItem(
+                source_id=job.source_id,
+                source_name=job.name,
+                url=dedupe_result.canonical_url,
+                hash=dedupe_result.hash_value,
+                title=title,
+                summary=item.get("summary", ""),
+                content=content,
+                published_at=_parse_published(item.get("published_at")),
+                language_hint=job.config.get("language"),
+            )
+        )
+    return pending
+
+
+def _build_news(pending: PendingItem, analysis: AnalysisResult) -> NewsItem:
+    news = NewsItem(
+        source_id=pending.source_id,
+        url=pending.url,
+        title=pending.title,
+        summary=pending.summary,
+        content=pending.content,
+        published_at=pending.published_at,
+        fetched_at=datetime.utcnow(),
+        hash=pending.hash,
+        language=analysis.scoring.get("language"),
+    )
+    news.analysis = Analysis(
+        impacted_symbols_json=json.dumps(analysis.impacted_symbols),
+        direction=analysis.direction,
+        confidence=analysis.confidence,
+        horizon=analysis.horizon,
+        rationale_json=json.dumps(analysis.rationale),
+        tags_json=json.dumps(analysis.tags),
+        entities_json=json.dumps(analysis.entities),
+        topics_json=json.dumps(analysis.topics),
+        scoring_json=json.dumps(analysis.scoring),
+    )
+    news.symbols = [NewsSymbol(symbol=symbol, fetched_at=news.fetched_at) for symbol in analysis.impacted_symbols]
+    return news
+
+
+def _write_batch(session: Session, batch: List[Tuple[PendingItem, AnalysisResult]]) -> List[Dict[str, Any]]:
+    rows = [_build_news(pending, analysis) for pending, analysis in batch]
+    session.add_all(rows)
+    session.flush()
+
+    alert_index.refresh(session)
+    fired: Dict[int, datetime] = {}
+    events: List[AlertEvent] = []
+    for news, (_, analysis) in zip(rows, batch):
+        events.extend(_evaluate_alerts(news.id, analysis, fired))
+    session.add_all(events)
+    started = time.monotonic()
+    session.commit()
+    commit_seconds.observe(time.monotonic() - started)
+    alert_index.record(fired)
+    alerts_fired.inc(len(events))
+    return [
+        news_payload(news, pending.source_name, analysis_payload(analysis))
+        for news, (pending, analysis) in zip(rows, batch)
+    ]
+
+
+def _persist(session: Session, batch: List[Tuple[PendingItem, AnalysisResult]]) -> List[Dict[str, Any]]:
+    if not batch:
+        return []
+    try:
+        return _write_batch(session, batch)
+    except IntegrityError:
+        session.rollback()
+    payloads = []
+    for entry in batch:
+        try:
+            payloads.extend(_write_batch(session, [entry]))
+        except IntegrityError:
+            session.rollback()
+    return payloads
+
+
+def _publish(payloads: List[Dict[str, Any]], received_at: Optional[float]) -> None:
+    event_hub.publish_threadsafe(payloads, received_at)
+
+
+@dataclass
+class IngestCycle:
+    source_ids: List[int]
+    skipped: int = 0
+    deferred: int = 0
+    failed: int = 0
+    new_items: int = 0
+    ingested: int = 0
+    analyze_ms: float = 0.0
+    write_ms: float = 0.0
+    started: float = field(default_factory=time.monotonic)
+    done: threading.Event = field(default_factory=threading.Event)
+
+    def __post_init__(self) -> None:
+        self.sources = len(self.source_ids)
+        self._remaining = self.sources
+        self._lock = threading.Lock()
+
+    def acquire(self, units: int) -> None:
+        with self._lock:
+            self._remaining += units
+
+    def record(self, **counts: float) -> None:
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def release(self, units: int = 1, **counts: float) -> None:
+        self.record(**counts)
+        with self._lock:
+            self._remaining -= units
+            finished = self._remaining == 0
+        if finished:
+            self._finish()
+
+    def _finish(self) -> None:
+        CYCLE_STATUS.update(
+            {
+                "last_cycle": datetime.utcnow().isoformat(),
+                "duration_ms": round((time.monotonic() - self.started) * 1000, 1),
+                "analyze_ms": round(self.analyze_ms, 1),
+                "write_ms": round(self.write_ms, 1),
+                "sources": self.sources,
+                "skipped": self.skipped,
+                "deferred": self.deferred,
+                "failed": self.failed,
+                "new_items": self.new_items,
+                "ingested": self.ingested,
+                "analysis_cache": analysis_cache.stats(),
+                "language_detection": language_detector.stats(),
+                "payload_cache": payload_cache.stats(),
+                "stream": event_hub.stats(),
+                "http": host_registry.stats(),
+                "page_cache": page_cache.stats(),
+            }
+        )
+        _store_status(self.source_ids)
+        self.done.set()
+
+
+def _store_status(source_ids: List[int]) -> None:
+    values = {
+        f"source:{source_id}": SOURCE_STATUS[source_id] for source_id in source_ids if source_id in SOURCE_STATUS
+    }
+    values["cycle"] = {**CYCLE_STATUS, "pipeline": ingest_pipeline.stats()}
     session = SessionLocal()
-    demo_mode = False
-    demo = None
     try:
-        sources = session.query(Source).filter(Source.enabled.is_(True)).all()
-        existing_urls = [item.url for item in session.query(NewsItem.url).all()]
-        existing_hashes = [item.hash for item in session.query(NewsItem.hash).all()]
-        existing_titles = [item.title for item in session.query(NewsItem.title).all()]
+        store_state(session, values)
+    except Exception:  # noqa: BLE001
+        session.rollback()
+    finally:
+        session.close()
+
+
+def _claim_source(source_id: int) -> bool:
+    with _in_flight_lock:
+        if source_id in _in_flight:
+            return False
+        _in_flight.add(source_id)
+        return True
+
+
+def _release_source(source_id: int) -> None:
+    with _in_flight_lock:
+        _in_flight.discard(source_id)
+
+
+def _fetch_stage(batch: List[Tuple[IngestCycle, FetchJob]]) -> None:
+    for cycle, job in batch:
+        items, status = _fetch_one(job)
+        ingest_pipeline["normalize"].put((cycle, job, items, status))
+
+
+def _normalize_stage(batch: List[Tuple[IngestCycle, FetchJob, List[dict[str, Any]], Dict[str, Any]]]) -> None:
+    if not dedupe_index.warmed:
+        session = SessionLocal()
+        try:
+            warm_dedupe_index(session)
+        finally:
+            session.close()
+    dedupe_index.prune()
+    for cycle, job, items, status in batch:
+        collected = _collect(job, items)
+        schedule = poll_planner.record(job.source_id, job.config, status["ok"], len(collected))
+        status.update(schedule.snapshot())
+        SOURCE_STATUS[job.source_id] = status
+        _release_source(job.source_id)
+        cycle.acquire(len(collected))
+        starts = range(0, len(collected), INGEST_ANALYZE_CHUNK)
+        job.expect(len(starts), status["ok"])
+        for start in starts:
+            ingest_pipeline["analyze"].put((cycle, job, collected[start : start + INGEST_ANALYZE_CHUNK]))
+        cycle.release(1, failed=0 if status["ok"] else 1, new_items=len(collected))
+
+
+def _analyze_stage(batch: List[Tuple[IngestCycle, FetchJob, List[PendingItem]]]) -> None:
+    for cycle, job, chunk in batch:
+        started = time.monotonic()
+        analyses = analyze_batch([(item.title, item.summary, item.content, item.language_hint) for item in chunk])
+        cycle.record(analyze_ms=(time.monotonic() - started) * 1000)
+        ingest_pipeline["write"].put((cycle, job, list(zip(chunk, analyses))))
+
+
+def _write_stage(batch: List[Tuple[IngestCycle, FetchJob, List[Tuple[PendingItem, AnalysisResult]]]]) -> None:
+    started = time.monotonic()
+    session = SessionLocal()
+    try:
+        payloads = _persist(session, [entry for _, _, chunk in batch for entry in chunk])
+        prime_payloads(payloads)
+    except Exception:
+        session.rollback()
+        dedupe_index.warmed = False
+        raise
+    finally:
+        session.close()
+    if payloads:
+        _publish(payloads, min(item.received_at for _, _, chunk in batch for item, _ in chunk))
+    written = {payload["url"] for payload in payloads}
+    write_ms = (time.monotonic() - started) * 1000
+    for cycle, job, chunk in batch:
+        job.settle()
+        cycle.release(len(chunk), ingested=sum(item.url in written for item, _ in chunk), write_ms=write_ms)
+
+
+def _drop_jobs(batch: List[Tuple[Any, ...]]) -> None:
+    for cycle, job, *_ in batch:
+        _release_source(job.source_id)
+        cycle.release(1, failed=1)
+
 
-        for source in sources:
+def _drop_chunks(batch: List[Tuple[IngestCycle, FetchJob, List[Any]]]) -> None:
+    dedupe_index.warmed = False
+    for cycle, job, chunk in batch:
+        job.settle(ok=False)
+        cycle.release(len(chunk))
+
+
+ingest_pipeline = Pipeline(
+    [
+        Stage("fetch", _fetch_stage, workers=FETCH_MAX_WORKERS, on_error=_drop_jobs),
+        Stage("normalize", _normalize_stage, on_error=_drop_jobs),
+        Stage("analyze", _analyze_stage, workers=INGEST_ANALYZE_WORKERS, on_error=_drop_chunks),
+        Stage(
+            "write",
+            _write_stage,
+            batch_size=max(1, INGEST_WRITE_BATCH // INGEST_ANALYZE_CHUNK),
+            on_error=_drop_chunks,
+        ),
+    ]
+)
+
+registry.callback(
+    "ingest_stage_queue_depth",
+    "Entries waiting in each ingest stage queue.",
+    "gauge",
+    lambda: {(name,): stage.queue.qsize() for name, stage in ingest_pipeline.stages.items()},
+    ("stage",),
+)
+
+
+def fetch_sources(force: bool = False, wait: bool = True) -> Optional[IngestCycle]:
+    jobs: List[FetchJob] = []
+    skipped = 0
+    enabled: Set[int] = set()
+    session = SessionLocal()
+    try:
+        for source in session.query(Source).filter(Source.enabled.is_(True)).all():
+            enabled.add(source.id)
             config = json.loads(source.config_json)
-            items: List[dict[str, Any]] = []
-            status = {"last_fetch": datetime.utcnow().isoformat(), "ok": True, "error": None}
-            try:
-                if source.type == "rss":
-                    items = fetch_rss(config["url"])
-                elif source.type == "html":
-                    fetcher = HtmlFetcher(min_interval=config.get("min_interval", 2.0))
-                    items = fetcher.fetch(config["url"])
-                elif source.type == "demo":
-                    demo_mode = True
-                    if demo is None:
-                        demo = _load_demo()
-                    items = demo.next_batch(batch_size=1)
-                else:
-                    status["ok"] = False
-                    status["error"] = "Unknown source type"
-            except Exception as exc:  # noqa: BLE001
-                status["ok"] = False
-                status["error"] = str(exc)
-
-            SOURCE_STATUS[source.id] = status
-
-            for item in items:
-                title = item.get("title", "")
-                summary = item.get("summary", "")
-                content = item.get("content", "")
-                url = item.get("url", "")
-                published_at = item.get("published_at")
-                if isinstance(published_at, str):
-                    try:
-                        published_at = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
-                    except ValueError:
-                        published_at = None
-
-                dedupe_result = compute_dedupe(title, content, existing_titles, url)
-                if is_duplicate(dedupe_result, existing_urls, existing_hashes):
-                    continue
-
-                news = NewsItem(
+            if not force and not poll_planner.due(source.id, config):
+                skipped += 1
+                continue
+            if not _claim_source(source.id):
+                skipped += 1
+                continue
+            jobs.append(
+                FetchJob(
                     source_id=source.id,
-                    url=dedupe_result.canonical_url,
-                    title=title,
-                    summary=summary,
-                    content=content,
-                    published_at=published_at,
-                    fetched_at=datetime.utcnow(),
-                    hash=dedupe_result.hash_value,
-                    language=None,
-                )
-                session.add(news)
-                session.flush()
-
-                analysis = analyze_item(title, summary, content)
-                news.language = analysis.scoring.get("language")
-                analysis_row = Analysis(
-                    news_item_id=news.id,
-                    impacted_symbols_json=json.dumps(analysis.impacted_symbols),
-                    direction=analysis.direction,
-                    confidence=analysis.confidence,
-                    horizon=analysis.horizon,
-                    rationale_json=json.dumps(analysis.rationale),
-                    tags_json=json.dumps(analysis.tags),
-                    entities_json=json.dumps(analysis.entities),
-                    topics_json=json.dumps(analysis.topics),
-                    scoring_json=json.dumps(analysis.scoring),
+                    name=source.name,
+                    type=source.type,
+                    config=config,
+                    timeout=float(config.get("timeout", FETCH_TIMEOUT_SECONDS)),
                 )
-                session.add(analysis_row)
-                session.flush()
-
-                _evaluate_alerts(session, news.id, analysis)
-
-                payload = {
-                    "id": news.id,
-                    "source": source.name,
-                    "url": news.url,
-                    "title": news.title,
-                    "summary": news.summary,
-                    "published_at": news.published_at.isoformat() if news.published_at else None,
-                    "fetched_at": news.fetched_at.isoformat(),
-                    "language": news.language,
+            )
+    finally:
+        session.close()
+    for source_id in poll_planner.source_ids() - enabled:
+        poll_planner.forget(source_id)
+    if not jobs:
+        return None
+
+    ingest_pipeline.start()
+    cycle = IngestCycle(source_ids=[job.source_id for job in jobs], skipped=skipped)
+    for job in jobs:
+        try:
+            ingest_pipeline["fetch"].put((cycle, job), block=False)
+        except queue.Full:
+            _release_source(job.source_id)
+            cycle.release(1, deferred=1)
+    if wait:
+        cycle.done.wait(FETCH_CYCLE_TIMEOUT_SECONDS)
+    return cycle
+
+
+def _evaluate_alerts(news_item_id: int, analysis: Any, fired: Dict[int, datetime]) -> List[AlertEvent]:
+    events = []
+    now = datetime.utcnow()
+    for alert_id in alert_index.match(analysis.impacted_symbols, analysis.direction, analysis.confidence):
+        if alert_index.is_debounced(alert_id, now, fired):
+            continue
+        fired[alert_id] = now
+        events.append(
+            AlertEvent(
+                alert_id=alert_id,
+                news_item_id=news_item_id,
+                triggered_at=now,
+                payload_json=json.dumps({
+                    "news_item_id": news_item_id,
                     "analysis": {
                         "impacted_symbols": analysis.impacted_symbols,
                         "direction": analysis.direction,
                         "confidence": analysis.confidence,
-                        "horizon": analysis.horizon,
-                        "rationale": analysis.rationale,
-                        "tags": analysis.tags,
-                        "entities": analysis.entities,
-                        "topics": analysis.topics,
-                        "scoring": analysis.scoring,
                     },
-                }
-                session.commit()
-                existing_urls.append(news.url)
-                existing_hashes.append(news.hash)
-                existing_titles.append(news.title)
-                try:
-                    import asyncio
-
-                    asyncio.run(event_hub.publish(payload))
-                except RuntimeError:
-                    pass
-    finally:
-        session.close()
+                }),
+            )
+        )
+    return events
 
 
-def _evaluate_alerts(session: SessionLocal, news_item_id: int, analysis: Any) -> None:
-    alerts = session.query(Alert).filter(Alert.enabled.is_(True)).all()
-    for alert in alerts:
-        rule = json.loads(alert.rule_json)
-        symbol = rule.get("symbol")
-        min_confidence = rule.get("min_confidence", 0)
-        direction = rule.get("direction")
-        if symbol and symbol not in analysis.impacted_symbols:
-            continue
-        if analysis.confidence < min_confidence:
-            continue
-        if direction and analysis.direction != direction:
-            continue
-        recent_event = (
-            session.query(AlertEvent)
-            .filter(AlertEvent.alert_id == alert.id)
-            .order_by(AlertEvent.triggered_at.desc())
-            .first()
-        )
-        if recent_event and (datetime.utcnow() - recent_event.triggered_at).total_seconds() < 600:
-            continue
-        event = AlertEvent(
-            alert_id=alert.id,
-            news_item_id=news_item_id,
-            payload_json=json.dumps({
-                "news_item_id": news_item_id,
-                "analysis": {
-                    "impacted_symbols": analysis.impacted_symbols,
-                    "direction": analysis.direction,
-                    "confidence": analysis.confidence,
-                },
-            }),
-        )
-        session.add(event)
+def ingest_tick() -> None:
+    was_leader = ingest_lease.held
+    if not ingest_lease.acquire(SessionLocal):
+        return
+    if not was_leader:
+        # Another process may have written items and alert events while this one was not leading.
+        dedupe_index.warmed = False
+        alert_index.invalidate()
+    fetch_sources(wait=False)
 
 
 def start_scheduler() -> BackgroundScheduler:
     scheduler = BackgroundScheduler()
-    scheduler.add_job(fetch_sources, "interval", seconds=60, id="fetch_sources")
+    scheduler.add_job(
+        ingest_tick,
+        "interval",
+        seconds=POLL_TICK_SECONDS,
+        id="fetch_sources",
+        max_instances=1,
+        coalesce=True,
+    )
     scheduler.start()
     return scheduler
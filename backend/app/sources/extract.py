@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from ..utils.text import clean_text
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - optional dependency
+    LexborHTMLParser = None
+
+HTML_TEXT_BUDGET = int(os.getenv("HTML_TEXT_BUDGET", "500"))
+HTML_PARSER = os.getenv("HTML_PARSER", "auto")
+FEED_CHUNK_SIZE = 8 * 1024
+
+SKIP_TAGS = frozenset({"script", "style", "noscript", "template", "svg", "nav", "header", "footer", "aside", "form"})
+META_KEYS = frozenset({"og:title", "og:url", "article:published_time"})
+
+
+@dataclass
+class PageExtract:
+    title: str
+    text: str
+    canonical_url: Optional[str] = None
+    published_at: Optional[datetime] = None
+
+
+class _PageParser(HTMLParser):
+    def __init__(self, budget: int) -> None:
+        super().__init__(convert_charrefs=True)
+        self.budget = budget
+        self.title_parts: List[str] = []
+        self.meta: Dict[str, str] = {}
+        self.canonical: Optional[str] = None
+        self.chunks: List[str] = []
+        self.size = 0
+        self.skip = 0
+        self.in_title = False
+        self.done = False
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag in SKIP_TAGS:
+            self.skip += 1
+        elif tag == "title":
+            self.in_title = True
+        elif tag == "meta":
+            values = dict(attrs)
+            key = (values.get("property") or values.get("name") or "").lower()
+            if key in META_KEYS and values.get("content") and key not in self.meta:
+                self.meta[key] = values["content"]
+        elif tag == "link" and self.canonical is None:
+            values = dict(attrs)
+            if "canonical" in (values.get("rel") or "").lower().split() and values.get("href"):
+                self.canonical = values["href"]
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag not in SKIP_TAGS:
+            self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in SKIP_TAGS:
+            self.skip = max(0, self.skip - 1)
+        elif tag == "title":
+            self.in_title = False
+
+    def handle_data(self, data: str) -> None:
+        if self.skip or self.done:
+            return
+        if self.in_title:
+            self.title_parts.append(data)
+            return
+        text = data.strip()
+        if text:
+            self.chunks.append(text)
+            self.size += len(text) + 1
+            self.done = self.size > self.budget
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _extract_stream(html: str, budget: int) -> Tuple[str, str, Dict[str, str], Optional[str]]:
+    parser = _PageParser(budget)
+    for offset in range(0, len(html), FEED_CHUNK_SIZE):
+        parser.feed(html[offset : offset + FEED_CHUNK_SIZE])
+        if parser.done:
+            break
+    else:
+        parser.close()
+    return "".join(parser.title_parts), " ".join(parser.chunks), parser.meta, parser.canonical
+
+
+def _extract_lexbor(html: str, budget: int) -> Tuple[str, str, Dict[str, str], Optional[str]]:
+    tree = LexborHTMLParser(html)
+    meta = {}
+    for node in tree.css("meta[property], meta[name]"):
+        key = (node.attributes.get("property") or node.attributes.get("name") or "").lower()
+        content = node.attributes.get("content")
+        if key in META_KEYS and content and key not in meta:
+            meta[key] = content
+    canonical = tree.css_first("link[rel~=canonical]")
+    title = tree.css_first("title")
+    chunks: List[str] = []
+    size = 0
+    if tree.body is not None:
+        tree.body.strip_tags(list(SKIP_TAGS))
+        for node in tree.body.traverse(include_text=True):
+            if node.tag != "-text":
+                continue
+            text = node.text_content.strip()
+            if text:
+                chunks.append(text)
+                size += len(text) + 1
+                if size > budget:
+                    break
+    return (
+        title.text() if title is not None else "",
+        " ".join(chunks),
+        meta,
+        canonical.attributes.get("href") if canonical is not None else None,
+    )
+
+
+def extract_page(html: str, url: str = "", budget: int = HTML_TEXT_BUDGET) -> PageExtract:
+    use_lexbor = LexborHTMLParser is not None and HTML_PARSER != "stdlib"
+    title, text, meta, canonical = (_extract_lexbor if use_lexbor else _extract_stream)(html, budget)
+    canonical = canonical or meta.get("og:url")
+    return PageExtract(
+        title=clean_text(meta.get("og:title") or title),
+        text=clean_text(text)[:budget],
+        canonical_url=urljoin(url, canonical) if canonical else None,
+        published_at=_parse_datetime(meta.get("article:published_time")),
+    )
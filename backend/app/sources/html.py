@@ -1,37 +1,48 @@
 from __future__ import annotations
 
+import time
 from datetime import datetime
 from typing import Any, List
 
-from bs4 import BeautifulSoup
-
-from ..utils.http import CachedSession, RateLimiter, RetrySession
+from ..db import SessionLocal
+from ..metrics import parse_seconds
+from ..utils.http import HTTP_CACHE_PATH, HostRegistry, ResponseCache, host_registry, remaining_time
 from ..utils.robots import RobotsCache
-from ..utils.text import clean_text
+from .extract import extract_page
+
+robots_cache = RobotsCache(session_factory=SessionLocal)
+page_cache = ResponseCache(ttl_seconds=600, session=host_registry, path=HTTP_CACHE_PATH or None)
 
 
 class HtmlFetcher:
-    def __init__(self, min_interval: float = 2.0) -> None:
-        self.rate_limiter = RateLimiter(min_interval=min_interval)
-        self.robots = RobotsCache()
-        self.session = RetrySession()
-        self.cache = CachedSession(ttl_seconds=600)
+    def __init__(
+        self,
+        min_interval: float = 2.0,
+        registry: HostRegistry = host_registry,
+        robots: RobotsCache = robots_cache,
+        cache: ResponseCache = page_cache,
+    ) -> None:
+        self.min_interval = min_interval
+        self.registry = registry
+        self.robots = robots
+        self.cache = cache
 
-    def fetch(self, url: str) -> List[dict[str, Any]]:
+    def fetch(self, url: str, timeout: float = 10) -> List[dict[str, Any]]:
+        deadline = time.monotonic() + timeout
         if not self.robots.allowed(url):
             return []
-        self.rate_limiter.wait()
-        response = self.cache.get(url)
-        soup = BeautifulSoup(response.text, "html.parser")
-        title = soup.title.text if soup.title else ""
-        summary = soup.get_text(" ")[:500]
+        self.registry.client(url, self.min_interval)
+        response = self.cache.get(url, timeout=remaining_time(deadline, timeout))
+        started = time.monotonic()
+        page = extract_page(response.text, url)
+        parse_seconds.observe(time.monotonic() - started, type="html")
         return [
             {
-                "title": clean_text(title),
-                "summary": clean_text(summary),
-                "url": url,
-                "published_at": None,
-                "content": clean_text(summary),
+                "title": page.title,
+                "summary": page.text,
+                "url": page.canonical_url or url,
+                "published_at": page.published_at,
+                "content": page.text,
                 "fetched_at": datetime.utcnow(),
             }
         ]
@@ -1,26 +1,165 @@
 from __future__ import annotations
 
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, List
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 import feedparser
 
+from ..metrics import parse_seconds
+from ..utils.http import host_registry
 from ..utils.text import clean_text
 
 
-def fetch_rss(url: str) -> List[dict[str, Any]]:
-    feed = feedparser.parse(url)
-    items: List[dict[str, Any]] = []
+@dataclass
+class FeedState:
+    etag: Optional[str] = None
+    modified: Optional[str] = None
+    body_hash: Optional[str] = None
+    hits: int = 0
+    misses: int = 0
+    last: Optional[str] = None
+    seen_keys: Set[str] = field(default_factory=set)
+    skipped: int = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "last": self.last, "skipped": self.skipped}
+
+    def seen(self, key: str) -> bool:
+        return key in self.seen_keys
+
+
+@dataclass
+class FeedUpdate:
+    url: str
+    fetched: bool = False
+    etag: Optional[str] = None
+    modified: Optional[str] = None
+    body_hash: Optional[str] = None
+    seen_keys: Optional[Set[str]] = None
+
+
+class FeedCache:
+    def __init__(self) -> None:
+        self._states: Dict[str, FeedState] = {}
+        self._lock = threading.Lock()
+
+    def state(self, url: str) -> FeedState:
+        with self._lock:
+            return self._states.setdefault(url, FeedState())
+
+    def commit(self, update: FeedUpdate) -> None:
+        state = self.state(update.url)
+        with self._lock:
+            if update.fetched:
+                state.etag, state.modified, state.body_hash = update.etag, update.modified, update.body_hash
+            if update.seen_keys is not None:
+                state.seen_keys = update.seen_keys
+
+
+feed_cache = FeedCache()
+
+
+def fetch_rss(
+    url: str, timeout: float = 20, cache: Optional[FeedCache] = None, incremental: bool = True
+) -> List[dict[str, Any]]:
+    items, update = read_rss(url, timeout=timeout, cache=cache, incremental=incremental)
+    (cache or feed_cache).commit(update)
+    return items
+
+
+def read_rss(
+    url: str, timeout: float = 20, cache: Optional[FeedCache] = None, incremental: bool = True
+) -> Tuple[List[dict[str, Any]], FeedUpdate]:
+    update = FeedUpdate(url)
+    return list(iter_rss(url, timeout=timeout, cache=cache, incremental=incremental, update=update)), update
+
+
+def iter_rss(
+    url: str,
+    timeout: float = 20,
+    cache: Optional[FeedCache] = None,
+    incremental: bool = True,
+    update: Optional[FeedUpdate] = None,
+) -> Iterator[dict[str, Any]]:
+    cache = cache or feed_cache
+    pending = update if update is not None else FeedUpdate(url)
+    yield from _iter_feed(url, timeout, cache.state(url), incremental, pending)
+    if update is None:
+        cache.commit(pending)
+
+
+def _iter_feed(
+    url: str, timeout: float, state: FeedState, incremental: bool, update: FeedUpdate
+) -> Iterator[dict[str, Any]]:
+    if not url.startswith(("http://", "https://")):
+        yield from _iter_entries(_parse_feed(url), state if incremental else None, update)
+        return
+
+    headers = {}
+    if state.etag:
+        headers["If-None-Match"] = state.etag
+    if state.modified:
+        headers["If-Modified-Since"] = state.modified
+    response = host_registry.get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304:
+        state.hits += 1
+        state.last = "not_modified"
+        return
+    response.raise_for_status()
+
+    update.fetched = True
+    update.etag = response.headers.get("ETag")
+    update.modified = response.headers.get("Last-Modified")
+    update.body_hash = hashlib.sha1(response.content).hexdigest()
+    if update.body_hash == state.body_hash:
+        state.hits += 1
+        state.last = "unchanged"
+        return
+    state.misses += 1
+    state.last = "fetched"
+    feed = _parse_feed(
+        response.content,
+        response_headers={
+            "content-type": response.headers.get("Content-Type", ""),
+            "content-location": response.url,
+        },
+    )
+    yield from _iter_entries(feed, state if incremental else None, update)
+
+
+def _parse_feed(source: Any, **kwargs: Any) -> Any:
+    started = time.monotonic()
+    try:
+        return feedparser.parse(source, **kwargs)
+    finally:
+        parse_seconds.observe(time.monotonic() - started, type="rss")
+
+
+def _entry_key(entry: Any) -> str:
+    return entry.get("id") or entry.get("link") or entry.get("title", "")
+
+
+def _iter_entries(feed: Any, state: Optional[FeedState], update: FeedUpdate) -> Iterator[dict[str, Any]]:
+    keys: Set[str] = set()
     for entry in feed.entries:
+        key = _entry_key(entry)
+        keys.add(key)
+        if state is not None and state.seen(key):
+            state.skipped += 1
+            continue
         published = None
         if getattr(entry, "published_parsed", None):
             published = datetime(*entry.published_parsed[:6])
-        item = {
+        yield {
             "title": clean_text(entry.get("title", "")),
             "summary": clean_text(entry.get("summary", "")),
             "url": entry.get("link", ""),
             "published_at": published,
             "content": clean_text(entry.get("summary", "")),
         }
-        items.append(item)
-    return items
+    if state is not None:
+        update.seen_keys = keys
@@ -1,26 +1,317 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, AsyncGenerator, Dict, List
+import json
+import os
+import time
+from collections import deque
+from typing import Any, AsyncGenerator, Callable, Deque, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+from .metrics import registry, sse_delivery_seconds
+
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", "256"))
+SSE_SLOW_CONSUMER_POLICY = os.getenv("SSE_SLOW_CONSUMER_POLICY", "drop_oldest")
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+SSE_REPLAY_SIZE = int(os.getenv("SSE_REPLAY_SIZE", "1000"))
+SSE_RELAY_SECONDS = float(os.getenv("SSE_RELAY_SECONDS", "1"))
+SSE_LATENCY_WINDOW = 1024
+
+HEARTBEAT_FRAME = b": keep-alive\n\n"
+
+Backfill = Callable[[int, int], List[Tuple[int, bytes]]]
+
+
+class EventMeta(NamedTuple):
+    source: Optional[str]
+    symbols: FrozenSet[str]
+    direction: Optional[str]
+    confidence: Optional[int]
+
+
+class StreamFilter(NamedTuple):
+    symbol: Optional[str] = None
+    source: Optional[str] = None
+    min_confidence: int = 0
+    direction: Optional[str] = None
+
+    def matches(self, meta: EventMeta) -> bool:
+        if self.source and meta.source != self.source:
+            return False
+        if self.symbol and self.symbol not in meta.symbols:
+            return False
+        if self.direction and meta.direction != self.direction:
+            return False
+        if self.min_confidence and meta.confidence is not None and meta.confidence < self.min_confidence:
+            return False
+        return True
+
+
+NO_FILTER = StreamFilter()
+
+Frame = Tuple[Optional[int], bytes, EventMeta]
+
+
+def event_meta(event: Dict[str, Any]) -> EventMeta:
+    analysis = event.get("analysis") or {}
+    return EventMeta(
+        source=event.get("source"),
+        symbols=frozenset(analysis.get("impacted_symbols") or ()),
+        direction=analysis.get("direction"),
+        confidence=analysis.get("confidence"),
+    )
+
+
+def encode_frame(body: bytes, event_id: Optional[int] = None) -> bytes:
+    if event_id is None:
+        return b"data: " + body + b"\n\n"
+    return b"id: " + str(event_id).encode("ascii") + b"\ndata: " + body + b"\n\n"
+
+
+def encode_event(event: Dict[str, Any]) -> bytes:
+    body = json.dumps(event, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return encode_frame(body, event.get("id"))
+
+
+class Subscriber:
+    def __init__(self, maxsize: int, stream_filter: StreamFilter = NO_FILTER) -> None:
+        self.filter = stream_filter
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, maxsize))
+        self.dropped = 0
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
 
 
 class EventHub:
-    def __init__(self) -> None:
-        self._subscribers: List[asyncio.Queue] = []
+    def __init__(
+        self,
+        queue_size: int = SSE_QUEUE_SIZE,
+        policy: str = SSE_SLOW_CONSUMER_POLICY,
+        heartbeat_seconds: float = SSE_HEARTBEAT_SECONDS,
+        replay_size: int = SSE_REPLAY_SIZE,
+    ) -> None:
+        if policy not in ("drop_oldest", "disconnect"):
+            raise ValueError(f"Unknown slow consumer policy: {policy}")
+        self.queue_size = queue_size
+        self.policy = policy
+        self.heartbeat_seconds = heartbeat_seconds
+        self.replay_size = replay_size
+        self._subscribers: List[Subscriber] = []
+        self._groups: Dict[StreamFilter, List[Subscriber]] = {}
+        self._history: Deque[Frame] = deque(maxlen=max(1, replay_size))
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._latencies: Deque[float] = deque(maxlen=SSE_LATENCY_WINDOW)
+        self.last_id: Optional[int] = None
+        self.published = 0
+        self.batches = 0
+        self.dropped = 0
+        self.disconnected = 0
+        self.replayed = 0
+        self.backfilled = 0
+        self.relayed = 0
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+
+    def broadcast(
+        self,
+        frame: bytes,
+        received_at: Optional[float] = None,
+        last_id: Optional[int] = None,
+        subscribers: Optional[List[Subscriber]] = None,
+    ) -> None:
+        entry = (frame, received_at, last_id)
+        for subscriber in list(self._subscribers if subscribers is None else subscribers):
+            if subscriber.closed:
+                continue
+            try:
+                subscriber.queue.put_nowait(entry)
+                continue
+            except asyncio.QueueFull:
+                pass
+            if self.policy == "disconnect":
+                subscriber.close()
+                self.disconnected += 1
+                continue
+            subscriber.queue.get_nowait()
+            subscriber.queue.put_nowait(entry)
+            subscriber.dropped += 1
+            self.dropped += 1
 
     async def publish(self, event: Dict[str, Any]) -> None:
-        for queue in list(self._subscribers):
-            await queue.put(event)
+        self._deliver([(event.get("id"), encode_event(event), event_meta(event))], None)
+
+    def publish_threadsafe(self, events: List[Dict[str, Any]], received_at: Optional[float] = None) -> bool:
+        loop = self._loop
+        if not events or loop is None or loop.is_closed():
+            return False
+        frames = [(event.get("id"), encode_event(event), event_meta(event)) for event in events]
+        try:
+            loop.call_soon_threadsafe(self._deliver, frames, received_at)
+        except RuntimeError:
+            return False
+        return True
+
+    def _deliver(self, frames: List[Frame], received_at: Optional[float]) -> None:
+        if self.last_id is not None:
+            frames = [frame for frame in frames if frame[0] is None or frame[0] > self.last_id]
+            if not frames:
+                return
+        last_id = None
+        for frame in frames:
+            if frame[0] is not None:
+                self._history.append(frame)
+                last_id = self.last_id = frame[0]
+        self.published += len(frames)
+        self.batches += 1
+        for stream_filter, subscribers in list(self._groups.items()):
+            if stream_filter == NO_FILTER:
+                selected = [frame for _, frame, _ in frames]
+            else:
+                selected = [frame for _, frame, meta in frames if stream_filter.matches(meta)]
+            if selected:
+                self.broadcast(b"".join(selected), received_at, last_id, subscribers)
 
-    async def subscribe(self) -> AsyncGenerator[str, None]:
-        queue: asyncio.Queue = asyncio.Queue()
-        self._subscribers.append(queue)
+    async def relay(self, poll: Backfill, interval: float = SSE_RELAY_SECONDS) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                rows = await asyncio.to_thread(poll, self.last_id or 0, self.replay_size)
+            except Exception:  # noqa: BLE001
+                continue
+            rows = [(event_id, body) for event_id, body in rows if self.last_id is None or event_id > self.last_id]
+            if rows:
+                self.relayed += len(rows)
+                self._deliver(
+                    [(event_id, encode_frame(body, event_id), event_meta(json.loads(body))) for event_id, body in rows],
+                    None,
+                )
+
+    async def subscribe(
+        self,
+        last_event_id: Optional[int] = None,
+        backfill: Optional[Backfill] = None,
+        stream_filter: StreamFilter = NO_FILTER,
+    ) -> AsyncGenerator[bytes, None]:
+        subscriber = Subscriber(self.queue_size, stream_filter)
+        self._subscribers.append(subscriber)
+        self._groups.setdefault(stream_filter, []).append(subscriber)
+        self._ensure_heartbeat()
         try:
+            resumed_at = None
+            if last_event_id is not None:
+                history = list(self._history)
+                if backfill is not None and (not history or history[0][0] > last_event_id + 1):
+                    async for frames, resumed_at in self._backfill(last_event_id, backfill, stream_filter):
+                        if frames:
+                            yield b"".join(frames)
+                else:
+                    frames = self._replay(last_event_id, history, stream_filter)
+                    if frames:
+                        yield b"".join(frames)
             while True:
-                event = await queue.get()
-                yield f"data: {event}\n\n"
+                entry = await subscriber.queue.get()
+                if entry is None:
+                    return
+                frame, received_at, last_id = entry
+                if resumed_at is not None and last_id is not None and last_id <= resumed_at:
+                    continue
+                if received_at is not None:
+                    latency = time.time() - received_at
+                    self._latencies.append(latency)
+                    sse_delivery_seconds.observe(latency)
+                yield frame
         finally:
-            self._subscribers.remove(queue)
+            self._subscribers.remove(subscriber)
+            group = self._groups[stream_filter]
+            group.remove(subscriber)
+            if not group:
+                del self._groups[stream_filter]
+
+    async def _backfill(
+        self, last_event_id: int, backfill: Backfill, stream_filter: StreamFilter
+    ) -> AsyncGenerator[Tuple[List[bytes], int], None]:
+        after_id = last_event_id
+        while True:
+            rows = await asyncio.to_thread(backfill, after_id, self.replay_size)
+            self.backfilled += len(rows)
+            if rows:
+                after_id = max(event_id for event_id, _ in rows)
+                yield [
+                    encode_frame(body, event_id)
+                    for event_id, body in rows
+                    if stream_filter == NO_FILTER or stream_filter.matches(event_meta(json.loads(body)))
+                ], after_id
+            if len(rows) < self.replay_size:
+                return
+
+    def _replay(self, last_event_id: int, history: List[Frame], stream_filter: StreamFilter) -> List[bytes]:
+        frames = [
+            frame for event_id, frame, meta in history if event_id > last_event_id and stream_filter.matches(meta)
+        ]
+        self.replayed += len(frames)
+        return frames
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "filter_groups": len(self._groups),
+            "published": self.published,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "disconnected": self.disconnected,
+            "policy": self.policy,
+            "buffered": len(self._history),
+            "replayed": self.replayed,
+            "backfilled": self.backfilled,
+            "relayed": self.relayed,
+            "last_id": self.last_id,
+            "latency_ms": _latency_summary(self._latencies),
+        }
+
+    def _ensure_heartbeat(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        if self.heartbeat_seconds <= 0:
+            return
+        task = self._heartbeat_task
+        if task is not None and not task.done() and task.get_loop() is self._loop:
+            return
+        self._heartbeat_task = self._loop.create_task(self._heartbeat())
+
+    async def _heartbeat(self) -> None:
+        while self._subscribers:
+            await asyncio.sleep(self.heartbeat_seconds)
+            for subscriber in list(self._subscribers):
+                if not subscriber.closed and subscriber.queue.empty():
+                    subscriber.queue.put_nowait((HEARTBEAT_FRAME, None, None))
+
+
+def _latency_summary(samples: Deque[float]) -> Dict[str, Optional[float]]:
+    if not samples:
+        return {"p50": None, "p99": None, "max": None}
+    ordered = sorted(samples)
+    return {
+        "p50": round(ordered[len(ordered) // 2] * 1000, 1),
+        "p99": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 1),
+        "max": round(ordered[-1] * 1000, 1),
+    }
 
 
 event_hub = EventHub()
+
+registry.callback("sse_subscribers", "Connected stream clients.", "gauge", lambda: len(event_hub))
+registry.callback("sse_published_total", "Events delivered to the stream hub.", "counter", lambda: event_hub.published)
+registry.callback(
+    "sse_dropped_total", "Events dropped from slow stream clients' queues.", "counter", lambda: event_hub.dropped
+)
+registry.callback(
+    "sse_disconnected_total", "Slow stream clients disconnected.", "counter", lambda: event_hub.disconnected
+)
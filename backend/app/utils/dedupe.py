@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+import threading
+from collections import Counter, deque
 from dataclasses import dataclass
-from typing import Iterable, List
+from datetime import datetime, timedelta
+from itertools import chain
+from typing import Container, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 
 from .text import canonicalize_url, content_hash, clean_text
 
+TITLE_SIMILARITY_THRESHOLD = 92
+TITLE_SEGMENT_CHARS = 4
+TITLE_LENGTH_BUCKET = 4
+
 
 @dataclass
 class DedupeResult:
@@ -19,16 +27,207 @@ def compute_dedupe(title: str, content: str, existing_titles: Iterable[str], url
     canonical_url = canonicalize_url(url)
     hash_value = content_hash(clean_text(f"{title} {content}"))
     similarity = 0
-    for other in existing_titles:
-        similarity = max(similarity, int(fuzz.ratio(title, other)))
+    if isinstance(existing_titles, TitleIndex):
+        similarity = existing_titles.best_similarity(title)
+    else:
+        for other in existing_titles:
+            similarity = max(similarity, int(fuzz.ratio(title, other)))
     return DedupeResult(canonical_url=canonical_url, hash_value=hash_value, title_similarity=similarity)
 
 
-def is_duplicate(result: DedupeResult, existing_urls: List[str], existing_hashes: List[str]) -> bool:
+def duplicate_reason(
+    result: DedupeResult, existing_urls: Container[str], existing_hashes: Container[str]
+) -> Optional[str]:
     if result.canonical_url in existing_urls:
-        return True
+        return "url"
     if result.hash_value in existing_hashes:
-        return True
-    if result.title_similarity >= 92:
-        return True
-    return False
+        return "hash"
+    if result.title_similarity >= TITLE_SIMILARITY_THRESHOLD:
+        return "title"
+    return None
+
+
+def is_duplicate(result: DedupeResult, existing_urls: Container[str], existing_hashes: Container[str]) -> bool:
+    return duplicate_reason(result, existing_urls, existing_hashes) is not None
+
+
+class TitleIndex:
+    def __init__(self, threshold: int = TITLE_SIMILARITY_THRESHOLD) -> None:
+        self.threshold = threshold
+        self._ids: Dict[str, int] = {}
+        self._titles: Dict[int, str] = {}
+        self._counts: Dict[int, int] = {}
+        self._postings: Dict[Tuple[int, int, str], List[int]] = {}
+        self._short: Set[int] = set()
+        self._next_id = 0
+        self._stale = 0
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._titles.values()))
+
+    def __contains__(self, title: object) -> bool:
+        return title in self._ids
+
+    def add(self, title: str) -> None:
+        title_id = self._ids.get(title)
+        if title_id is not None:
+            self._counts[title_id] += 1
+            return
+        title_id = self._next_id
+        self._next_id += 1
+        self._ids[title] = title_id
+        self._titles[title_id] = title
+        self._counts[title_id] = 1
+        length = len(title)
+        bucket = length // TITLE_LENGTH_BUCKET
+        for part in range(length // TITLE_SEGMENT_CHARS):
+            start = part * TITLE_SEGMENT_CHARS
+            self._postings.setdefault((bucket, part, title[start : start + TITLE_SEGMENT_CHARS]), []).append(title_id)
+        if self._required(self._length_range(length)[-1], length) < 1:
+            self._short.add(title_id)
+
+    def remove(self, title: str) -> None:
+        title_id = self._ids.get(title)
+        if title_id is None:
+            return
+        self._counts[title_id] -= 1
+        if self._counts[title_id] > 0:
+            return
+        del self._ids[title], self._titles[title_id], self._counts[title_id]
+        self._short.discard(title_id)
+        self._stale += 1
+        if self._stale > max(1024, len(self._titles)):
+            self._compact()
+
+    def clear(self) -> None:
+        self._ids.clear()
+        self._titles.clear()
+        self._counts.clear()
+        self._postings.clear()
+        self._short.clear()
+        self._stale = 0
+
+    def candidates(self, title: str) -> List[str]:
+        # Count filter: fuzz.ratio >= threshold allows at most `edits` insertions/deletions, and each breaks at most
+        # one of a stored title's fixed-width segments, so a match shares at least segments - edits of them with
+        # the probe, each shifted by no more than the edits around it. Short titles where that bound reaches zero
+        # are always compared.
+        length = len(title)
+        required: Dict[int, int] = {}
+        windows: Dict[int, Tuple[int, int, int]] = {}
+        for other_length in self._length_range(length):
+            edits = self._edits(length, other_length)
+            delta = length - other_length
+            if edits < abs(delta):
+                continue
+            required[other_length] = self._required(length, other_length)
+            if required[other_length] < 1:
+                continue
+            low, high = -((edits - delta) // 2), (edits + delta) // 2
+            bucket = other_length // TITLE_LENGTH_BUCKET
+            if bucket in windows:
+                low, high = min(low, windows[bucket][0]), max(high, windows[bucket][1])
+            windows[bucket] = (low, high, other_length // TITLE_SEGMENT_CHARS)
+
+        size = TITLE_SEGMENT_CHARS
+        texts = [title[position : position + size] for position in range(length - size + 1)]
+        postings = []
+        for bucket, (low, high, parts) in windows.items():
+            for part in range(parts):
+                start = part * size
+                for text in set(texts[max(0, start + low) : start + high + 1]):
+                    ids = self._postings.get((bucket, part, text))
+                    if ids:
+                        postings.append(ids)
+        counts = Counter(chain.from_iterable(postings))
+        floor = min((count for count in required.values() if count > 0), default=1)
+        matches = []
+        for title_id in [title_id for title_id, count in counts.items() if count >= floor]:
+            other = self._titles.get(title_id)
+            if other is not None and counts[title_id] >= required.get(len(other), 0) > 0:
+                matches.append(other)
+        for title_id in self._short:
+            other = self._titles[title_id]
+            if required.get(len(other), 1) < 1:
+                matches.append(other)
+        return matches
+
+    def _length_range(self, length: int) -> range:
+        ratio = self.threshold / 100
+        return range(int(length * ratio / (2 - ratio)), int(length * (2 - ratio) / ratio) + 1)
+
+    def _edits(self, length: int, other_length: int) -> int:
+        return int((1 - self.threshold / 100) * (length + other_length) + 1e-9)
+
+    def _required(self, length: int, other_length: int) -> int:
+        return other_length // TITLE_SEGMENT_CHARS - self._edits(length, other_length)
+
+    def best_similarity(self, title: str) -> int:
+        if title in self._ids:
+            return 100
+        match = process.extractOne(title, self.candidates(title), scorer=fuzz.ratio, score_cutoff=self.threshold)
+        return int(match[1]) if match else 0
+
+    def _compact(self) -> None:
+        postings: Dict[Tuple[int, int, str], List[int]] = {}
+        for key, ids in self._postings.items():
+            live = [title_id for title_id in ids if title_id in self._titles]
+            if live:
+                postings[key] = live
+        self._postings = postings
+        self._stale = 0
+
+
+class DedupeIndex:
+    def __init__(self, window: Optional[timedelta] = None) -> None:
+        self.window = window
+        self.urls: Set[str] = set()
+        self.hashes: Set[str] = set()
+        self.titles = TitleIndex()
+        self.warmed = False
+        self._entries: Deque[Tuple[datetime, str, str, str]] = deque()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.titles)
+
+    def add(self, url: str, hash_value: str, title: str, seen_at: Optional[datetime] = None) -> None:
+        with self._lock:
+            self.urls.add(url)
+            self.hashes.add(hash_value)
+            self.titles.add(title)
+            if self.window is not None:
+                self._entries.append((seen_at or datetime.utcnow(), url, hash_value, title))
+
+    def load(self, rows: Iterable[Tuple[str, str, str, Optional[datetime]]]) -> None:
+        for url, hash_value, title, seen_at in rows:
+            self.add(url, hash_value, title, seen_at)
+        self.warmed = True
+
+    def prune(self, now: Optional[datetime] = None) -> int:
+        if self.window is None:
+            return 0
+        cutoff = (now or datetime.utcnow()) - self.window
+        removed = 0
+        with self._lock:
+            while self._entries and self._entries[0][0] < cutoff:
+                _, url, hash_value, title = self._entries.popleft()
+                self.urls.discard(url)
+                self.hashes.discard(hash_value)
+                self.titles.remove(title)
+                removed += 1
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self.urls.clear()
+            self.hashes.clear()
+            self.titles.clear()
+            self._entries.clear()
+            self.warmed = False
@@ -1,11 +1,28 @@
 from __future__ import annotations
 
+import json
+import os
+import sqlite3
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
 
 import requests
-from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", "")
+HTTP_CACHE_DISK_MAX_BYTES = int(os.getenv("HTTP_CACHE_DISK_MAX_BYTES", str(256 * 1024 * 1024)))
+USER_AGENT = "NewsTrackerBot/1.0"
+READ_CHUNK_BYTES = 64 * 1024
+RETRY_STATUSES = (502, 503, 504)
 
 
 @dataclass
@@ -14,43 +31,358 @@ class RateLimiter:
 
     def __post_init__(self) -> None:
         self._last_call = 0.0
+        self._lock = threading.Lock()
 
     def wait(self) -> None:
-        elapsed = time.time() - self._last_call
-        if elapsed < self.min_interval:
-            time.sleep(self.min_interval - elapsed)
-        self._last_call = time.time()
+        with self._lock:
+            now = time.time()
+            scheduled = max(now, self._last_call + self.min_interval)
+            self._last_call = scheduled
+        if scheduled > now:
+            time.sleep(scheduled - now)
 
 
-class CachedSession:
-    def __init__(self, ttl_seconds: int = 300, maxsize: int = 512) -> None:
-        self.cache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+class HostClient:
+    def __init__(self, host: str, min_interval: float = 0.0) -> None:
+        self.host = host
+        self.rate_limiter = RateLimiter(min_interval=min_interval)
         self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.requests = 0
+
+    def get(self, url: str, timeout: float = 10, **kwargs: Any) -> requests.Response:
+        # requests applies timeout per socket operation; the deadline bounds the whole call, including retries, the
+        # rate-limit wait and a server that trickles the body. Connection errors and 502/503/504 are retried while
+        # time is left; a read timeout is not.
+        deadline = time.monotonic() + timeout
+        attempt = 0
+        while True:
+            self.rate_limiter.wait()
+            self.requests += 1
+            try:
+                response = self._read(url, deadline, timeout, **kwargs)
+                if response.status_code not in RETRY_STATUSES or attempt >= HTTP_RETRIES:
+                    return response
+            except requests.ConnectionError:
+                if attempt >= HTTP_RETRIES:
+                    raise
+            time.sleep(min(0.5 * 2**attempt, remaining_time(deadline, timeout)))
+            attempt += 1
 
-    def get(self, url: str, timeout: int = 10, **kwargs) -> requests.Response:
-        if url in self.cache:
-            return self.cache[url]
-        response = self.session.get(url, timeout=timeout, **kwargs)
-        self.cache[url] = response
+    def _read(self, url: str, deadline: float, timeout: float, **kwargs: Any) -> requests.Response:
+        response = self.session.get(url, timeout=remaining_time(deadline, timeout), stream=True, **kwargs)
+        chunks = []
+        try:
+            while True:
+                chunk = response.raw.read1(READ_CHUNK_BYTES, decode_content=True)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                remaining_time(deadline, timeout)
+        except ReadTimeoutError as exc:
+            response.close()
+            raise requests.Timeout(exc) from exc
+        except ProtocolError as exc:
+            response.close()
+            raise requests.ConnectionError(exc) from exc
+        except Exception:
+            response.close()
+            raise
+        response._content = b"".join(chunks)
+        response._content_consumed = True
+        response.raw.release_conn()
         return response
 
+    def close(self) -> None:
+        self.session.close()
 
-class RetrySession:
-    def __init__(self, retries: int = 3, backoff: float = 1.5) -> None:
-        self.retries = retries
-        self.backoff = backoff
-        self.session = requests.Session()
 
-    def get(self, url: str, timeout: int = 10, **kwargs) -> requests.Response:
-        last_error: Optional[Exception] = None
-        for attempt in range(self.retries):
-            try:
-                response = self.session.get(url, timeout=timeout, **kwargs)
-                response.raise_for_status()
-                return response
-            except Exception as exc:  # noqa: BLE001
-                last_error = exc
-                time.sleep(self.backoff ** attempt)
-        if last_error:
-            raise last_error
-        raise RuntimeError("Request failed without exception")
+def remaining_time(deadline: float, timeout: float) -> float:
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise requests.Timeout(f"Timed out after {timeout:g}s")
+    return remaining
+
+
+class HostRegistry:
+    def __init__(self) -> None:
+        self._clients: Dict[str, HostClient] = {}
+        self._lock = threading.Lock()
+
+    def client(self, url: str, min_interval: Optional[float] = None) -> HostClient:
+        parsed = urlparse(url)
+        host = f"{parsed.scheme}://{parsed.netloc}"
+        with self._lock:
+            client = self._clients.get(host)
+            if client is None:
+                client = self._clients[host] = HostClient(host, min_interval or 0.0)
+            elif min_interval is not None and min_interval > client.rate_limiter.min_interval:
+                client.rate_limiter.min_interval = min_interval
+            return client
+
+    def get(self, url: str, timeout: float = 10, **kwargs: Any) -> requests.Response:
+        return self.client(url).get(url, timeout=timeout, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"hosts": len(self._clients), "requests": sum(client.requests for client in self._clients.values())}
+
+    def close(self) -> None:
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+
+host_registry = HostRegistry()
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+    stored_at: float
+    max_age: float
+
+    @property
+    def size(self) -> int:
+        return len(self.content) + sum(len(key) + len(value) for key, value in self.headers.items())
+
+    @property
+    def text(self) -> str:
+        content_type = self.headers.get("content-type", "")
+        if "charset=" in content_type:
+            encoding = content_type.split("charset=", 1)[1].split(";", 1)[0].strip().strip('"') or "utf-8"
+            return self.content.decode(encoding, errors="replace")
+        try:
+            return self.content.decode("utf-8")
+        except UnicodeDecodeError:
+            return self.content.decode("latin-1")
+
+    def fresh(self, now: float) -> bool:
+        return now - self.stored_at < self.max_age
+
+    def validators(self) -> Dict[str, str]:
+        headers = {}
+        if "etag" in self.headers:
+            headers["If-None-Match"] = self.headers["etag"]
+        if "last-modified" in self.headers:
+            headers["If-Modified-Since"] = self.headers["last-modified"]
+        return headers
+
+
+def _max_age(headers: Dict[str, str], default: float) -> Optional[float]:
+    directives = {}
+    for part in headers.get("cache-control", "").lower().split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name] = value.strip('"')
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    for name in ("s-maxage", "max-age"):
+        if directives.get(name, "").isdigit():
+            return float(directives[name])
+    if "expires" in headers:
+        try:
+            expires = parsedate_to_datetime(headers["expires"]).timestamp()
+        except (TypeError, ValueError):
+            return 0.0
+        return max(0.0, expires - time.time())
+    return default
+
+
+class _DiskTier:
+    def __init__(self, path: str, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses (url TEXT PRIMARY KEY, status INTEGER, headers TEXT, "
+            "body BLOB, stored_at REAL, max_age REAL, size INTEGER)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS ix_responses_stored_at ON responses (stored_at)")
+        self._connection.commit()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        row = self._connection.execute(
+            "SELECT status, headers, body, stored_at, max_age FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        return CachedResponse(url, row[0], json.loads(row[1]), row[2], row[3], row[4])
+
+    def put(self, entry: CachedResponse) -> None:
+        self._connection.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                entry.url,
+                entry.status_code,
+                json.dumps(entry.headers),
+                entry.content,
+                entry.stored_at,
+                entry.max_age,
+                entry.size,
+            ),
+        )
+        excess = self.size() - self.max_bytes
+        if excess > 0:
+            evicted = []
+            for url, size in self._connection.execute("SELECT url, size FROM responses ORDER BY stored_at").fetchall():
+                if excess <= 0:
+                    break
+                evicted.append((url,))
+                excess -= size
+            self._connection.executemany("DELETE FROM responses WHERE url = ?", evicted)
+        self._connection.commit()
+
+    def delete(self, url: str) -> None:
+        self._connection.execute("DELETE FROM responses WHERE url = ?", (url,))
+        self._connection.commit()
+
+    def touch(self, url: str, stored_at: float, max_age: float) -> None:
+        self._connection.execute(
+            "UPDATE responses SET stored_at = ?, max_age = ? WHERE url = ?", (stored_at, max_age, url)
+        )
+        self._connection.commit()
+
+    def size(self) -> int:
+        return self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        ttl_seconds: float = 300,
+        max_bytes: int = HTTP_CACHE_MAX_BYTES,
+        session: Any = None,
+        path: Optional[str] = None,
+        disk_max_bytes: int = HTTP_CACHE_DISK_MAX_BYTES,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.session = session or requests.Session()
+        self.disk = _DiskTier(path, disk_max_bytes) if path else None
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.disk_hits = 0
+
+    def get(self, url: str, timeout: float = 10, **kwargs: Any) -> CachedResponse:
+        now = time.time()
+        entry = self._lookup(url)
+        if entry is not None and entry.fresh(now):
+            with self._lock:
+                self.hits += 1
+            return entry
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry is not None:
+            headers.update(entry.validators())
+        response = self.session.get(url, timeout=timeout, headers=headers, **kwargs)
+        if entry is not None and response.status_code == 304:
+            refreshed = {key.lower(): value for key, value in response.headers.items()}
+            entry.stored_at = now
+            entry.max_age = _max_age({**entry.headers, **refreshed}, self.ttl_seconds) or 0.0
+            with self._lock:
+                self.revalidated += 1
+                if self.disk is not None:
+                    self.disk.touch(url, entry.stored_at, entry.max_age)
+            return entry
+
+        with self._lock:
+            self.misses += 1
+        entry = CachedResponse(
+            url=url,
+            status_code=response.status_code,
+            headers={key.lower(): value for key, value in response.headers.items()},
+            content=response.content,
+            stored_at=now,
+            max_age=0.0,
+        )
+        max_age = _max_age(entry.headers, self.ttl_seconds)
+        if response.status_code == 200 and max_age is not None:
+            entry.max_age = max_age
+            self._store(entry)
+        else:
+            self._discard(url)
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            requests_seen = self.hits + self.misses + self.revalidated
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "disk_bytes": self.disk.size() if self.disk is not None else 0,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "hit_rate": round((self.hits + self.revalidated) / requests_seen, 3) if requests_seen else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
+
+    def _lookup(self, url: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+                return entry
+            if self.disk is None:
+                return None
+            entry = self.disk.get(url)
+            if entry is not None:
+                self.disk_hits += 1
+        if entry is not None:
+            self._remember(entry)
+        return entry
+
+    def _store(self, entry: CachedResponse) -> None:
+        self._remember(entry)
+        if self.disk is not None:
+            with self._lock:
+                self.disk.put(entry)
+
+    def _remember(self, entry: CachedResponse) -> None:
+        with self._lock:
+            previous = self._entries.pop(entry.url, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            if entry.size > self.max_bytes:
+                return
+            self._entries[entry.url] = entry
+            self._bytes += entry.size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+
+    def _discard(self, url: str) -> None:
+        with self._lock:
+            previous = self._entries.pop(url, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            if self.disk is not None:
+                self.disk.delete(url)
+
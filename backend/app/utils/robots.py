@@ -1,31 +1,98 @@
 from __future__ import annotations
 
+import os
+import threading
 from dataclasses import dataclass
-from typing import Dict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
 from urllib.parse import urlparse
 
 import robotexclusionrulesparser as rerp
 
-from .http import RetrySession
+from ..models import RobotsTxt
+from .http import HostRegistry, host_registry
+
+ROBOTS_TTL_SECONDS = int(os.getenv("ROBOTS_TTL_SECONDS", "86400"))
 
 
 @dataclass
 class RobotsCache:
     user_agent: str = "NewsTrackerBot"
+    ttl_seconds: int = ROBOTS_TTL_SECONDS
+    registry: HostRegistry = host_registry
+    session_factory: Optional[Callable[[], Any]] = None
 
     def __post_init__(self) -> None:
-        self._parsers: Dict[str, rerp.RobotExclusionRulesParser] = {}
-        self._session = RetrySession()
+        self._parsers: Dict[str, Tuple[rerp.RobotExclusionRulesParser, datetime]] = {}
+        self._domain_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.fetches = 0
+        self.loads = 0
 
     def allowed(self, url: str) -> bool:
-        domain = urlparse(url).netloc
-        if domain not in self._parsers:
-            parser = rerp.RobotExclusionRulesParser()
-            robots_url = f"https://{domain}/robots.txt"
-            try:
-                response = self._session.get(robots_url, timeout=5)
-                parser.parse(response.text)
-            except Exception:
-                parser.parse("")
-            self._parsers[domain] = parser
-        return self._parsers[domain].is_allowed(self.user_agent, url)
+        parsed = urlparse(url)
+        domain = parsed.netloc
+        now = datetime.utcnow()
+        ttl = timedelta(seconds=self.ttl_seconds)
+        with self._lock:
+            cached = self._parsers.get(domain)
+            domain_lock = self._domain_locks.setdefault(domain, threading.Lock())
+        if cached is None or now - cached[1] >= ttl:
+            with domain_lock:
+                with self._lock:
+                    cached = self._parsers.get(domain)
+                if cached is None or now - cached[1] >= ttl:
+                    cached = self._load(domain, now - ttl)
+                    if cached is None:
+                        cached = self._fetch(parsed.scheme or "https", domain, now)
+                    with self._lock:
+                        self._parsers[domain] = cached
+        return cached[0].is_allowed(self.user_agent, url)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _parser(self, body: str) -> rerp.RobotExclusionRulesParser:
+        parser = rerp.RobotExclusionRulesParser()
+        parser.parse(body)
+        return parser
+
+    def _fetch(self, scheme: str, domain: str, now: datetime) -> Tuple[rerp.RobotExclusionRulesParser, datetime]:
+        robots_url = f"{scheme}://{domain}/robots.txt"
+        try:
+            response = self.registry.get(robots_url, timeout=5)
+            response.raise_for_status()
+            body = response.text
+        except Exception:  # noqa: BLE001
+            body = ""
+        self._count("fetches")
+        self._store(domain, body, now)
+        return self._parser(body), now
+
+    def _load(self, domain: str, fresh_after: datetime) -> Optional[Tuple[rerp.RobotExclusionRulesParser, datetime]]:
+        if self.session_factory is None:
+            return None
+        session = self.session_factory()
+        try:
+            row = session.get(RobotsTxt, domain)
+            if row is None or row.fetched_at < fresh_after:
+                return None
+            self._count("loads")
+            return self._parser(row.body), row.fetched_at
+        except Exception:  # noqa: BLE001
+            return None
+        finally:
+            session.close()
+
+    def _store(self, domain: str, body: str, fetched_at: datetime) -> None:
+        if self.session_factory is None:
+            return
+        session = self.session_factory()
+        try:
+            session.merge(RobotsTxt(domain=domain, body=body, fetched_at=fetched_at))
+            session.commit()
+        except Exception:  # noqa: BLE001
+            session.rollback()
+        finally:
+            session.close()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import threading
+
+from .analysis.engine import shutdown_pool
+from .db import SessionLocal, init_db
+from .metrics import serve_metrics
+from .scheduler import ingest_lease, ingest_pipeline, ingest_tick, start_scheduler
+from .sources.html import page_cache
+from .utils.http import host_registry
+
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    logging.getLogger("apscheduler").setLevel(logging.WARNING)
+    init_db()
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+
+    metrics_server = serve_metrics(METRICS_PORT) if METRICS_PORT else None
+    scheduler = start_scheduler()
+    logger.info("Ingest worker %s started", ingest_lease.holder)
+    ingest_tick()
+    stop.wait()
+
+    logger.info("Ingest worker %s stopping", ingest_lease.holder)
+    scheduler.shutdown(wait=False)
+    if metrics_server is not None:
+        metrics_server.shutdown()
+    ingest_pipeline.stop()
+    ingest_lease.release(SessionLocal)
+    shutdown_pool()
+    page_cache.close()
+    host_registry.close()
+
+
+if __name__ == "__main__":
+    main()
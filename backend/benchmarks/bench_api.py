@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import argparse
+import json
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, List
+
+import requests
+import uvicorn
+from fastapi import Depends
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.analysis.engine import analyze_item
+from app.db import Base
+from app.main import app, get_db
+from app.models import NewsItem, Source
+from app.payloads import payload_cache
+from app.scheduler import PendingItem, _build_news
+from app.schemas import NewsOut
+
+HEADLINES = [
+    "Fed signals rate cut as inflation cools",
+    "Gold rallies on risk-off demand",
+    "ECB holds rates, euro slips",
+    "Oil jumps after OPEC surprise",
+    "Bitcoin slides as crypto funds see outflows",
+    "Dollar firms on hawkish Fed minutes",
+]
+
+
+def _seed(session: Session, news: int) -> None:
+    session.add_all([Source(name=f"source {i}", type="rss", config_json="{}", enabled=True) for i in range(10)])
+    session.flush()
+    started = datetime.utcnow() - timedelta(days=30)
+    for i in range(news):
+        title = f"{HEADLINES[i % len(HEADLINES)]} ({i})"
+        summary = "Markets react to the latest macro headlines. " * 4
+        pending = PendingItem(i % 10 + 1, "", f"https://example.com/{i}", f"{i:064x}", title, summary, summary, None)
+        item = _build_news(pending, analyze_item(title, summary, summary))
+        item.fetched_at = started + timedelta(seconds=i * 30)
+        for symbol in item.symbols:
+            symbol.fetched_at = item.fetched_at
+        session.add(item)
+    session.commit()
+
+
+def _legacy_serialize(item: NewsItem) -> NewsOut:
+    analysis = None
+    if item.analysis:
+        analysis = {
+            "impacted_symbols": json.loads(item.analysis.impacted_symbols_json),
+            "direction": item.analysis.direction,
+            "confidence": item.analysis.confidence,
+            "horizon": item.analysis.horizon,
+            "rationale": json.loads(item.analysis.rationale_json),
+            "tags": json.loads(item.analysis.tags_json),
+            "entities": json.loads(item.analysis.entities_json or "[]"),
+            "topics": json.loads(item.analysis.topics_json or "[]"),
+            "scoring": json.loads(item.analysis.scoring_json or "{}"),
+        }
+    return NewsOut(
+        id=item.id,
+        source=item.source.name if item.source else "",
+        url=item.url,
+        title=item.title,
+        summary=item.summary,
+        content=item.content,
+        published_at=item.published_at,
+        fetched_at=item.fetched_at,
+        language=item.language,
+        analysis=analysis,
+    )
+
+
+@app.get("/bench/legacy-news", response_model=List[NewsOut])
+def legacy_news(limit: int = 100, db: Session = Depends(get_db)) -> List[NewsOut]:
+    items = db.query(NewsItem).order_by(NewsItem.fetched_at.desc()).limit(limit).all()
+    return [_legacy_serialize(item) for item in items]
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def _load(url: str, clients: int, requests_per_client: int) -> List[float]:
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def client() -> None:
+        own = []
+        with requests.Session() as http:
+            for _ in range(requests_per_client):
+                started = time.perf_counter()
+                http.get(url).raise_for_status()
+                own.append((time.perf_counter() - started) * 1000)
+        with lock:
+            latencies.extend(own)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="/api/news latency under concurrent clients")
+    parser.add_argument("--news", type=int, default=2_000)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(
+            f"sqlite:///{Path(directory) / 'bench.db'}",
+            connect_args={"check_same_thread": False},
+            pool_size=40,
+            max_overflow=0,
+        )
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+        with factory() as session:
+            _seed(session, args.news)
+
+        def bench_db() -> Iterator[Session]:
+            db = factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.router.on_startup.clear()
+        app.router.on_shutdown.clear()
+        app.dependency_overrides[get_db] = bench_db
+        port = _free_port()
+        server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.05)
+
+        base = f"http://127.0.0.1:{port}"
+        endpoints = {
+            "legacy": f"{base}/bench/legacy-news?limit={args.limit}",
+            "cached": f"{base}/api/news?limit={args.limit}",
+        }
+        print(f"{args.clients} clients x {args.requests} requests, limit={args.limit}")
+        print(f"{'endpoint':<10} {'p50 ms':>10} {'p99 ms':>10} {'req/s':>10}")
+        for name, url in endpoints.items():
+            payload_cache.clear()
+            requests.get(url).raise_for_status()
+            started = time.perf_counter()
+            latencies = _load(url, args.clients, args.requests)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{name:<10} {statistics.median(latencies):>10.1f} {_percentile(latencies, 0.99):>10.1f}"
+                f" {len(latencies) / elapsed:>10.0f}"
+            )
+        server.should_exit = True
+        thread.join()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import time
+from itertools import accumulate
+from typing import List
+
+from rapidfuzz import fuzz
+
+from app.utils.dedupe import TITLE_SIMILARITY_THRESHOLD, TitleIndex
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+def _vocabulary(rng: random.Random, size: int = 20_000) -> List[str]:
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))))
+    return sorted(words)
+
+
+def _titles(rng: random.Random, vocabulary: List[str], count: int) -> List[str]:
+    cum_weights = list(accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+    output = []
+    for _ in range(count):
+        words = rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(6, 12))
+        output.append(" ".join(words).capitalize())
+    return output
+
+
+def _near_duplicate(rng: random.Random, title: str) -> str:
+    chars = list(title)
+    position = rng.randrange(len(chars))
+    chars[position] = rng.choice(string.ascii_lowercase)
+    return "".join(chars) + rng.choice(["", ".", "!"])
+
+
+def _linear(title: str, titles: List[str]) -> int:
+    similarity = 0
+    for other in titles:
+        similarity = max(similarity, int(fuzz.ratio(title, other)))
+    return similarity
+
+
+def run(sizes: List[int], queries: int, linear_limit: int, seed: int) -> None:
+    rng = random.Random(seed)
+    vocabulary = _vocabulary(rng)
+    stored = _titles(rng, vocabulary, max(sizes))
+    print(f"{'stored':>10} {'build s':>8} {'index us/item':>14} {'avg cand':>9} {'linear us/item':>15} {'recall':>7}")
+    for size in sizes:
+        titles = stored[:size]
+        started = time.perf_counter()
+        index = TitleIndex()
+        for title in titles:
+            index.add(title)
+        build = time.perf_counter() - started
+
+        probes = [_near_duplicate(rng, rng.choice(titles)) for _ in range(queries // 2)]
+        probes += _titles(rng, vocabulary, queries - len(probes))
+
+        started = time.perf_counter()
+        indexed = [index.best_similarity(probe) for probe in probes]
+        per_item = (time.perf_counter() - started) / len(probes) * 1e6
+        candidates = sum(len(index.candidates(probe)) for probe in probes) / len(probes)
+
+        linear = "-"
+        recall = "-"
+        if size <= linear_limit:
+            sample = probes[: max(10, queries // 10)]
+            started = time.perf_counter()
+            expected = [_linear(probe, titles) for probe in sample]
+            linear = f"{(time.perf_counter() - started) / len(sample) * 1e6:.0f}"
+            hits = [i for i, value in enumerate(expected) if value >= TITLE_SIMILARITY_THRESHOLD]
+            found = [i for i in hits if indexed[i] >= TITLE_SIMILARITY_THRESHOLD]
+            recall = f"{len(found) / len(hits):.3f}" if hits else "n/a"
+        print(f"{size:>10} {build:>8.1f} {per_item:>14.1f} {candidates:>9.1f} {linear:>15} {recall:>7}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-item title dedupe latency: TitleIndex vs linear scan")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--linear-limit", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.sizes, args.queries, args.linear_limit, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from bs4 import BeautifulSoup
+
+from app.sources import extract
+from app.sources.extract import _extract_stream, extract_page
+from app.utils.text import clean_text
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def legacy_extract(html: str) -> Tuple[str, str]:
+    soup = BeautifulSoup(html, "html.parser")
+    title = soup.title.text if soup.title else ""
+    return clean_text(title), clean_text(soup.get_text(" ")[:500])
+
+
+def _measure(func: Callable[[str], object], html: str, repeat: int) -> Tuple[float, float]:
+    timings: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(html)
+        timings.append((time.perf_counter() - started) * 1000)
+    tracemalloc.start()
+    func(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak / 1024 / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare HTML extraction engines on saved pages.")
+    parser.add_argument("paths", nargs="*", type=Path, help="HTML files (default: benchmarks/fixtures/*.html)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engines = [
+        ("beautifulsoup (legacy)", legacy_extract),
+        ("stream", lambda html: _extract_stream(html, extract.HTML_TEXT_BUDGET)),
+    ]
+    if extract.LexborHTMLParser is not None:
+        engines.append(("lexbor", lambda html: extract._extract_lexbor(html, extract.HTML_TEXT_BUDGET)))
+
+    for path in args.paths or sorted(FIXTURES.glob("*.html")):
+        html = path.read_text(encoding="utf-8")
+        page = extract_page(html)
+        print(f"{path.name}: {len(html) / 1024:.0f} KB, title={page.title[:40]!r}, published={page.published_at}")
+        for name, func in engines:
+            median_ms, peak_mb = _measure(func, html, args.repeat)
+            print(f"  {name:<24} {median_ms:8.2f} ms  peak {peak_mb:6.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
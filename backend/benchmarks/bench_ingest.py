@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import create_engine, desc, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.analysis.engine import AnalysisResult
+from app.db import Base, configure_sqlite
+from app.models import Alert, Analysis, NewsItem, Source
+from app.scheduler import PendingItem, _build_news, _write_batch
+
+
+def _batch(start: int, size: int) -> List[Tuple[PendingItem, AnalysisResult]]:
+    analysis = AnalysisResult(
+        impacted_symbols=["XAU/USD"],
+        direction="bullish",
+        confidence=60,
+        horizon="intraday",
+        rationale=["Risk-off language suggests safe-haven bid for gold."],
+        tags=["Risk-off"],
+        entities=["Gold"],
+        topics=["Risk-off"],
+        scoring={"language": "en", "rules": ["risk_off_gold"]},
+    )
+    return [
+        (
+            PendingItem(
+                source_id=1,
+                source_name="Bench",
+                url=f"https://bench.test/{i}",
+                hash=f"{i:064x}",
+                title=f"Gold jumps on risk-off {i}",
+                summary="Risk-off tone boosts gold demand",
+                content="Risk-off tone boosts gold demand",
+                published_at=None,
+            ),
+            analysis,
+        )
+        for i in range(start, start + size)
+    ]
+
+
+def _write_per_item(session: Session, batch: List[Tuple[PendingItem, AnalysisResult]]) -> None:
+    for pending, analysis in batch:
+        session.add(_build_news(pending, analysis))
+        session.flush()
+        session.commit()
+
+
+def _read_loop(engine: Engine, stop: threading.Event, latencies: List[float]) -> None:
+    with Session(engine) as session:
+        while not stop.is_set():
+            started = time.perf_counter()
+            session.execute(
+                select(NewsItem.id).join(Source).outerjoin(Analysis).order_by(desc(NewsItem.fetched_at)).limit(100)
+            ).all()
+            session.rollback()
+            latencies.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.005)
+
+
+def _run(
+    engine: Engine, writer: Callable[[Session, List[Tuple[PendingItem, AnalysisResult]]], object], items: int, cycle: int
+) -> Dict[str, float]:
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with factory() as session:
+        session.add(Source(name="Bench", type="rss", config_json="{}", enabled=True))
+        session.add(Alert(name="gold", rule_json='{"symbol": "XAU/USD"}', enabled=True))
+        session.commit()
+
+    stop = threading.Event()
+    latencies: List[float] = []
+    reader = threading.Thread(target=_read_loop, args=(engine, stop, latencies), daemon=True)
+    reader.start()
+    started = time.perf_counter()
+    with factory() as session:
+        for offset in range(0, items, cycle):
+            writer(session, _batch(offset, min(cycle, items - offset)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    reader.join()
+    latencies.sort()
+    return {
+        "items/s": items / elapsed,
+        "read p50 ms": statistics.median(latencies) if latencies else 0.0,
+        "read p99 ms": latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0,
+        "reads": len(latencies),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ingest throughput and read latency: per-item commits vs batched WAL")
+    parser.add_argument("--items", type=int, default=3000)
+    parser.add_argument("--cycle", type=int, default=300)
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        legacy = create_engine(f"sqlite:///{Path(directory) / 'legacy.db'}", connect_args={"check_same_thread": False})
+        results["per-item, rollback journal"] = _run(legacy, _write_per_item, args.items, args.cycle)
+        legacy.dispose()
+
+        batched = create_engine(f"sqlite:///{Path(directory) / 'wal.db'}", connect_args={"check_same_thread": False})
+        configure_sqlite(batched)
+        results["batched, WAL"] = _run(batched, _write_batch, args.items, args.cycle)
+        batched.dispose()
+
+    print(f"{'mode':<28} {'items/s':>9} {'read p50 ms':>12} {'read p99 ms':>12} {'reads':>6}")
+    for mode, row in results.items():
+        print(
+            f"{mode:<28} {row['items/s']:>9.0f} {row['read p50 ms']:>12.2f} {row['read p99 ms']:>12.2f} {row['reads']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict
+
+from sqlalchemy import create_engine, desc, inspect, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.db import Base
+from app.migrations import run_migrations
+from app.models import Alert, AlertEvent, Analysis, NewsItem, Source
+
+
+def _seed(engine: Engine, news: int, alerts: int, events: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    started = datetime.utcnow() - timedelta(days=365)
+    rng = random.Random(3)
+    with engine.begin() as connection:
+        connection.execute(
+            Source.__table__.insert(),
+            [{"name": f"source {i}", "type": "rss", "config_json": "{}", "enabled": True} for i in range(40)],
+        )
+        for offset in range(0, news, 50_000):
+            batch = range(offset, min(news, offset + 50_000))
+            connection.execute(
+                NewsItem.__table__.insert(),
+                [
+                    {
+                        "id": i + 1,
+                        "source_id": rng.randint(1, 40),
+                        "url": f"https://example.com/story/{i}",
+                        "title": f"Story {i}",
+                        "summary": "",
+                        "content": "",
+                        "fetched_at": started + timedelta(seconds=i * 30),
+                        "hash": f"{i:064x}",
+                    }
+                    for i in batch
+                ],
+            )
+            connection.execute(
+                Analysis.__table__.insert(),
+                [
+                    {
+                        "news_item_id": i + 1,
+                        "impacted_symbols_json": '["DXY"]',
+                        "direction": "uncertain",
+                        "confidence": rng.randint(0, 100),
+                        "horizon": "intraday",
+                        "rationale_json": "[]",
+                        "tags_json": "[]",
+                        "created_at": started,
+                    }
+                    for i in batch
+                ],
+            )
+        connection.execute(
+            Alert.__table__.insert(),
+            [{"name": f"alert {i}", "rule_json": "{}", "enabled": True, "created_at": started} for i in range(alerts)],
+        )
+        connection.execute(
+            AlertEvent.__table__.insert(),
+            [
+                {
+                    "alert_id": rng.randint(1, alerts),
+                    "news_item_id": rng.randint(1, news),
+                    "triggered_at": started + timedelta(seconds=i * 60),
+                    "payload_json": "{}",
+                }
+                for i in range(events)
+            ],
+        )
+
+
+def _drop_secondary_indexes(engine: Engine) -> None:
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            for index in inspect(connection).get_indexes(table.name):
+                if index["name"] != f"ix_{table.name}_id":
+                    connection.exec_driver_sql(f"DROP INDEX {index['name']}")
+
+
+def _queries(news: int, alerts: int) -> Dict[str, Callable[[Session], object]]:
+    rng = random.Random(5)
+    return {
+        "latest 100 news": lambda s: s.execute(
+            select(NewsItem.id).join(Source).outerjoin(Analysis).order_by(desc(NewsItem.fetched_at)).limit(100)
+        ).all(),
+        "news by url": lambda s: s.execute(
+            select(NewsItem.id).where(NewsItem.url == f"https://example.com/story/{rng.randrange(news)}")
+        ).first(),
+        "news by hash": lambda s: s.execute(select(NewsItem.id).where(NewsItem.hash == f"{rng.randrange(news):064x}")).first(),
+        "analysis by news id": lambda s: s.execute(
+            select(Analysis.id).where(Analysis.news_item_id == rng.randint(1, news))
+        ).first(),
+        "last event per alert": lambda s: s.execute(
+            select(AlertEvent.id)
+            .where(AlertEvent.alert_id == rng.randint(1, alerts))
+            .order_by(desc(AlertEvent.triggered_at))
+            .limit(1)
+        ).first(),
+    }
+
+
+def _time(engine: Engine, news: int, alerts: int, repeat: int) -> Dict[str, float]:
+    timings = {}
+    with Session(engine) as session:
+        for name, query in _queries(news, alerts).items():
+            query(session)
+            started = time.perf_counter()
+            for _ in range(repeat):
+                query(session)
+            timings[name] = (time.perf_counter() - started) / repeat * 1000
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query timings before/after the index migration")
+    parser.add_argument("--news", type=int, default=200_000)
+    parser.add_argument("--alerts", type=int, default=200)
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{Path(directory) / 'bench.db'}")
+        _seed(engine, args.news, args.alerts, args.events)
+        _drop_secondary_indexes(engine)
+        before = _time(engine, args.news, args.alerts, args.repeat)
+        run_migrations(engine)
+        after = _time(engine, args.news, args.alerts, args.repeat)
+        engine.dispose()
+
+    print(f"{'query':<22} {'before ms':>10} {'after ms':>10}")
+    for name in before:
+        print(f"{name:<22} {before[name]:>10.3f} {after[name]:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
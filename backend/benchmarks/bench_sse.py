@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import argparse
+import ast
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, AsyncGenerator, Dict, List
+
+from app.sse import EventHub, StreamFilter
+
+
+class LegacyHub:
+    def __init__(self) -> None:
+        self._subscribers: List[asyncio.Queue] = []
+
+    async def publish(self, event: Dict[str, Any]) -> None:
+        for queue in list(self._subscribers):
+            await queue.put(event)
+
+    async def subscribe(self) -> AsyncGenerator[str, None]:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        try:
+            while True:
+                event = await queue.get()
+                yield f"data: {event}\n\n"
+        finally:
+            self._subscribers.remove(queue)
+
+
+SYMBOLS = ["EUR/USD", "GBP/USD", "USD/JPY", "XAU/USD", "BTC", "WTI", "DXY", "AUD/USD", "USD/CAD", "SPX"]
+
+
+def _event(index: int) -> Dict[str, Any]:
+    return {
+        "id": index,
+        "source": "Wire",
+        "title": f"Markets move on macro headlines ({index})",
+        "summary": "Markets react to the latest macro headlines. " * 6,
+        "sent_at": time.perf_counter(),
+        "analysis": {"impacted_symbols": [SYMBOLS[index % len(SYMBOLS)]], "direction": "bullish", "confidence": 70},
+    }
+
+
+def _end_event() -> Dict[str, Any]:
+    return {"end": True, "analysis": {"impacted_symbols": SYMBOLS, "direction": "bullish", "confidence": 100}}
+
+
+async def _consume(stream: AsyncGenerator, latencies: List[float], received: List[int]) -> None:
+    async for frame in stream:
+        if isinstance(frame, bytes):
+            frame = frame.decode("utf-8")
+        received.append(len(frame))
+        for line in frame.splitlines():
+            if not line.startswith("data: "):
+                continue
+            body = line[len("data: "):]
+            try:
+                event = json.loads(body)
+            except ValueError:
+                event = ast.literal_eval(body)
+            if event.get("end"):
+                return
+            latencies.append((time.perf_counter() - event["sent_at"]) * 1000)
+
+
+async def _run(hub: Any, subscribers: int, slow: int, events: int, interval: float, filtered: bool) -> Dict[str, float]:
+    latencies: List[float] = []
+    received: List[int] = []
+    stalled = [hub.subscribe() for _ in range(slow)]
+    stalled_tasks = [asyncio.ensure_future(stream.__anext__()) for stream in stalled]
+    consumers = []
+    for index in range(subscribers - slow):
+        if filtered:
+            stream = hub.subscribe(stream_filter=StreamFilter(symbol=SYMBOLS[index % len(SYMBOLS)]))
+        else:
+            stream = hub.subscribe()
+        consumers.append(asyncio.ensure_future(_consume(stream, latencies, received)))
+    await asyncio.sleep(0.05)
+
+    publish_times = []
+    for index in range(events):
+        started = time.perf_counter()
+        await hub.publish(_event(index))
+        publish_times.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+    await hub.publish(_end_event())
+    await asyncio.wait_for(asyncio.gather(*consumers), timeout=120)
+
+    backlog = max((queue.qsize() for queue in _queues(hub)), default=0)
+    for task in stalled_tasks:
+        task.cancel()
+    await asyncio.gather(*stalled_tasks, return_exceptions=True)
+    return {
+        "publish_p50": statistics.median(publish_times),
+        "publish_max": max(publish_times),
+        "deliver_p50": statistics.median(latencies),
+        "deliver_p99": sorted(latencies)[int(len(latencies) * 0.99)],
+        "max_backlog": backlog,
+        "kb_per_client": sum(received) / max(1, subscribers - slow) / 1024,
+    }
+
+
+def _queues(hub: Any) -> List[asyncio.Queue]:
+    if isinstance(hub, EventHub):
+        return [subscriber.queue for subscriber in hub._subscribers]
+    return list(hub._subscribers)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SSE fan-out with many subscribers")
+    parser.add_argument("--subscribers", type=int, default=1_000)
+    parser.add_argument("--slow", type=int, default=100)
+    parser.add_argument("--events", type=int, default=300)
+    parser.add_argument("--interval", type=float, default=0.005)
+    args = parser.parse_args()
+
+    runs = {
+        "legacy": (LegacyHub(), False),
+        "shared": (EventHub(queue_size=64, heartbeat_seconds=0), False),
+        "filtered": (EventHub(queue_size=64, heartbeat_seconds=0), True),
+    }
+    print(f"{args.subscribers} subscribers ({args.slow} stalled), {args.events} events")
+    print(f"{'hub':<9} {'pub p50':>9} {'pub max':>9} {'dlv p50':>9} {'dlv p99':>9} {'backlog':>8} {'KB/client':>10}")
+    for name, (hub, filtered) in runs.items():
+        result = asyncio.run(_run(hub, args.subscribers, args.slow, args.events, args.interval, filtered))
+        print(
+            f"{name:<9} {result['publish_p50']:>9.2f} {result['publish_max']:>9.2f} {result['deliver_p50']:>9.1f}"
+            f" {result['deliver_p99']:>9.1f} {result['max_backlog']:>8} {result['kb_per_client']:>10.1f}"
+        )
+    print("times in ms; backlog = deepest stalled subscriber queue; filtered = one symbol per client")
+
+
+if __name__ == "__main__":
+    main()
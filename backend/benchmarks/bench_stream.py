@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import requests
+import uvicorn
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import scheduler
+from app.db import Base
+from app.main import app
+from app.models import Source
+from app.sse import event_hub
+from app.utils.dedupe import DedupeIndex
+from benchmarks.bench_api import _free_port
+
+WORDS = (
+    "gold dollar euro yen bitcoin oil rates inflation payrolls yields equities bonds crude copper sterling franc "
+    "rally slump surge slide rebound stall climb sink widen narrow jumps eases firms softens extends trims"
+).split()
+
+
+def _client(url: str, fetched: Dict[str, float], latencies: List[float], ready: threading.Event) -> None:
+    with requests.get(url, stream=True, timeout=60) as response:
+        ready.set()
+        for line in response.iter_lines():
+            if not line.startswith(b"data: "):
+                continue
+            event = json.loads(line[len(b"data: "):])
+            if event["title"] not in fetched:
+                return
+            latencies.append((time.time() - fetched[event["title"]]) * 1000)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ingest-to-client latency over /api/stream")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--items", type=int, default=25)
+    args = parser.parse_args()
+
+    fetched: Dict[str, float] = {}
+    rng = random.Random(11)
+
+    def fake_fetch(job: Any, demo: Any) -> List[Dict[str, Any]]:
+        cycle = len(fetched) // args.items
+        items = []
+        for index in range(args.items):
+            title = " ".join(rng.sample(WORDS, 8))
+            items.append({"title": title, "url": f"https://wire.test/{cycle}/{index}", "content": title})
+        now = time.time()
+        fetched.update({item["title"]: now for item in items})
+        return items
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{Path(directory) / 'bench.db'}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+        with factory() as session:
+            session.add(Source(name="Wire", type="rss", config_json="{}", enabled=True))
+            session.commit()
+        scheduler.SessionLocal = factory
+        scheduler.dedupe_index = DedupeIndex()
+        scheduler._fetch_items = fake_fetch
+
+        app.router.on_startup[:] = [handler for handler in app.router.on_startup if handler.__name__ == "bind_event_hub"]
+        app.router.on_shutdown.clear()
+        port = _free_port()
+        server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.05)
+
+        scheduler.analyze_batch([("warm up", "", "", None)])
+        latencies: List[float] = []
+        clients = []
+        for _ in range(args.clients):
+            ready = threading.Event()
+            client = threading.Thread(
+                target=_client, args=(f"http://127.0.0.1:{port}/api/stream", fetched, latencies, ready)
+            )
+            client.start()
+            ready.wait(5)
+            clients.append(client)
+        while len(event_hub) < args.clients:
+            time.sleep(0.01)
+
+        for _ in range(args.cycles):
+            worker = threading.Thread(target=scheduler.fetch_sources, kwargs={"force": True})
+            worker.start()
+            worker.join()
+            time.sleep(0.1)
+        event_hub.publish_threadsafe([{"title": ""}])
+        for client in clients:
+            client.join(30)
+        server.should_exit = True
+        thread.join(5)
+        engine.dispose()
+
+    ordered = sorted(latencies)
+    print(f"{args.clients} clients, {args.cycles} cycles x {args.items} fetched items, {len(latencies)} deliveries")
+    print(f"fetch-to-client  p50 {statistics.median(ordered):.1f} ms  p99 {ordered[int(len(ordered) * 0.99)]:.1f} ms")
+    print(f"server-side      {event_hub.stats()['latency_ms']}")
+    print(f"cycle            {scheduler.CYCLE_STATUS['analyze_ms']} ms analyze, {scheduler.CYCLE_STATUS['write_ms']} ms write")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import json
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.alerts import AlertIndex
+from app.db import Base
+from app.models import Alert
+
+
+def _brute_force(rules, symbols, direction, confidence):
+    matched = []
+    for alert_id, rule in rules:
+        if rule.get("symbol") and rule["symbol"] not in symbols:
+            continue
+        if confidence < rule.get("min_confidence", 0):
+            continue
+        if rule.get("direction") and rule["direction"] != direction:
+            continue
+        matched.append(alert_id)
+    return sorted(matched)
+
+
+def test_alert_index_matches_linear_rule_scan() -> None:
+    rng = random.Random(7)
+    symbols = ["EUR/USD", "XAU/USD", "BTC", "DXY", None]
+    directions = ["bullish", "bearish", "uncertain", None]
+    rules = []
+    for alert_id in range(1, 301):
+        rule = {"symbol": rng.choice(symbols), "direction": rng.choice(directions)}
+        if rng.random() < 0.8:
+            rule["min_confidence"] = rng.randint(0, 100)
+        rules.append((alert_id, rule))
+    index = AlertIndex()
+    index.compile(rules)
+
+    for _ in range(500):
+        impacted = rng.sample(symbols[:-1], rng.randint(0, 3))
+        direction = rng.choice(directions[:-1])
+        confidence = rng.randint(0, 100)
+        assert index.match(impacted, direction, confidence) == _brute_force(rules, impacted, direction, confidence)
+
+
+def test_alert_index_debounce_and_invalidate() -> None:
+    index = AlertIndex(debounce_seconds=600)
+    index.compile([(1, {"symbol": "BTC"})])
+    now = datetime(2024, 1, 1)
+    fired = {}
+
+    assert not index.is_debounced(1, now, fired)
+    fired[1] = now
+    assert index.is_debounced(1, now + timedelta(seconds=10), fired)
+    assert not index.is_debounced(1, now + timedelta(seconds=10))
+    index.record(fired)
+    assert index.is_debounced(1, now + timedelta(seconds=599))
+    assert not index.is_debounced(1, now + timedelta(seconds=600))
+
+    index.invalidate()
+    assert not index.loaded
+    assert index.last_triggered(1) == now
+
+
+def test_alert_index_refresh_picks_up_alerts_from_other_processes(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'alerts.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    index = AlertIndex()
+    with factory() as session:
+        session.add(Alert(name="gold", rule_json=json.dumps({"symbol": "XAU/USD"}), enabled=True))
+        session.commit()
+        index.refresh(session)
+    assert index.match(["EUR/USD"], "bullish", 50) == []
+
+    with factory() as other:
+        other.add(Alert(name="euro", rule_json=json.dumps({"symbol": "EUR/USD"}), enabled=True))
+        other.commit()
+    with factory() as session:
+        index.refresh(session)
+    assert index.match(["EUR/USD"], "bullish", 50) == [2]
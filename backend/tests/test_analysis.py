@@ -1,4 +1,11 @@
-from app.analysis.engine import analyze_item
+from app.analysis.engine import (
+    SYMBOL_RULES,
+    analysis_cache,
+    analyze_batch,
+    analyze_item,
+    get_matcher,
+    shutdown_pool,
+)
 
 
 def test_symbol_mapping_for_gold() -> None:
@@ -10,3 +17,49 @@ def test_impact_scoring_rules() -> None:
     analysis = analyze_item("Fed signals rate cut", "", "Dovish tone and rate cut discussions weigh on USD")
     assert analysis.direction in {"bearish", "bullish", "uncertain"}
     assert 0 <= analysis.confidence <= 100
+
+
+def test_rule_matcher_uses_word_boundaries() -> None:
+    hits = get_matcher().scan("Turmoil in software stocks as real yields rise and rate cuts loom")
+    assert "WTI" not in hits.symbols
+    assert hits.symbols == ["XAU/USD"]
+    assert hits.topics == ["Fed", "Real yields"]
+    assert {"yields", "dovish"} <= hits.triggers
+
+    hits = get_matcher().scan("Eurozone inflationary pressure builds as cryptocurrency slump hits treasuries")
+    assert hits.symbols == ["XAU/USD", "EUR/USD", "BTC"]
+    assert hits.topics == ["CPI", "Real yields"]
+
+
+def test_rule_matcher_rebuilds_when_rules_change(monkeypatch) -> None:
+    before = get_matcher()
+    monkeypatch.setitem(SYMBOL_RULES, "NZD/USD", ["kiwi"])
+    assert "NZD/USD" in analyze_item("Kiwi slides", "", "").impacted_symbols
+    assert get_matcher() is not before
+
+
+def test_analyze_batch_matches_analyze_item() -> None:
+    templates = [
+        ("Gold jumps on risk-off", "", "Risk-off tone boosts gold demand"),
+        ("Fed signals rate cut", "", "Dovish tone and rate cut discussions weigh on USD"),
+        ("Oil climbs on supply conflict", "Crude higher", ""),
+    ]
+    items = [(f"{title} {index}", summary, content) for index in range(8) for title, summary, content in templates]
+    analysis_cache.clear()
+    try:
+        batched = analyze_batch(items, workers=2)
+    finally:
+        shutdown_pool()
+    assert batched == [analyze_item(*item) for item in items]
+
+
+def test_analysis_cache_hits_and_invalidates_on_rule_change(monkeypatch) -> None:
+    analysis_cache.clear()
+    before = analysis_cache.stats()
+    first = analyze_item("Yen slides as BOJ holds", "", "")
+    second = analyze_item("Yen slides as BOJ holds", "", "")
+    assert first == second
+    assert analysis_cache.stats()["hits"] == before["hits"] + 1
+
+    monkeypatch.setitem(SYMBOL_RULES, "USD/JPY", ["usdjpy"])
+    assert "USD/JPY" not in analyze_item("Yen slides as BOJ holds", "", "").impacted_symbols
@@ -0,0 +1,97 @@
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import main
+from app.analysis.engine import analyze_item
+from app.db import Base
+from app.main import get_news, list_news
+from app.models import NewsItem, Source
+from app.payloads import payload_cache
+from app.schemas import NewsOut
+from app.scheduler import PendingItem, _build_news
+
+
+def _seed(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'api.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    payload_cache.clear()
+    session.add(Source(name="Wire", type="rss", config_json="{}", enabled=True))
+    session.flush()
+    titles = ["Bitcoin rallies", "Gold slips", "Bitcoin slides", "Crypto funds grow", "Gold rises"]
+    started = datetime(2024, 1, 1)
+    for index, title in enumerate(titles):
+        pending = PendingItem(1, "Wire", f"https://wire.test/{index}", f"h{index}", title, "", "", None)
+        news = _build_news(pending, analyze_item(title, "", ""))
+        news.fetched_at = started + timedelta(minutes=index)
+        for symbol in news.symbols:
+            symbol.fetched_at = news.fetched_at
+        session.add(news)
+    session.commit()
+    return session
+
+
+def _json(response):
+    return json.loads(response.body)
+
+
+def test_list_news_filters_symbol_in_sql_with_cursor(tmp_path) -> None:
+    session = _seed(tmp_path)
+
+    page = _json(list_news(symbol="BTC", limit=2, db=session))
+    assert [item["title"] for item in page] == ["Crypto funds grow", "Bitcoin slides"]
+
+    before = datetime.fromisoformat(page[-1]["fetched_at"])
+    rest = _json(list_news(symbol="BTC", limit=2, before_id=page[-1]["id"], before_fetched_at=before, db=session))
+    assert [item["title"] for item in rest] == ["Bitcoin rallies"]
+
+    assert _json(list_news(limit=1, before_id=rest[0]["id"], db=session)) == []
+    assert len(_json(list_news(db=session))) == 5
+    session.close()
+
+
+def test_list_news_pages_past_a_pruned_cursor(tmp_path) -> None:
+    session = _seed(tmp_path)
+    page = _json(list_news(limit=2, db=session))
+    session.query(NewsItem).filter(NewsItem.id == page[-1]["id"]).delete()
+    session.commit()
+
+    rest = _json(list_news(limit=2, before_id=page[-1]["id"], db=session))
+    assert [item["title"] for item in rest] == ["Bitcoin slides", "Gold slips"]
+    assert _json(list_news(before_id=1, db=session)) == []
+    session.close()
+
+
+def test_cached_payload_matches_schema(tmp_path) -> None:
+    session = _seed(tmp_path)
+    item = session.query(NewsItem).filter(NewsItem.title == "Gold slips").one()
+    expected = NewsOut(
+        id=item.id,
+        source="Wire",
+        url=item.url,
+        title=item.title,
+        summary=item.summary,
+        content=item.content,
+        published_at=item.published_at,
+        fetched_at=item.fetched_at,
+        language=item.language,
+        analysis=_json(get_news(item.id, db=session))["analysis"],
+    )
+
+    assert _json(get_news(item.id, db=session)) == expected.model_dump(mode="json")
+    assert payload_cache.stats()["hits"] >= 1
+    session.close()
+
+
+def test_stream_backfill_returns_cached_payloads_after_id(tmp_path, monkeypatch) -> None:
+    session = _seed(tmp_path)
+    monkeypatch.setattr(main, "SessionLocal", sessionmaker(bind=session.get_bind()))
+
+    rows = main._stream_backfill(2, 2)
+
+    assert [event_id for event_id, _ in rows] == [3, 4]
+    assert [json.loads(body)["title"] for _, body in rows] == ["Bitcoin slides", "Crypto funds grow"]
+    session.close()
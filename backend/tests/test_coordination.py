@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.coordination import LeaderLease, current_leader, load_state, load_value, store_state
+from app.db import Base, configure_sqlite
+from app.models import Lease
+
+
+def _factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'coordination.db'}")
+    configure_sqlite(engine)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def test_leader_lease_is_exclusive_until_expiry_or_release(tmp_path) -> None:
+    factory = _factory(tmp_path)
+    first = LeaderLease("ingest", ttl_seconds=60, holder="api-1")
+    second = LeaderLease("ingest", ttl_seconds=60, holder="api-2")
+
+    assert first.acquire(factory)
+    assert not second.acquire(factory)
+    assert first.acquire(factory)
+
+    with factory() as session:
+        session.get(Lease, "ingest").expires_at = datetime.utcnow() - timedelta(seconds=1)
+        session.commit()
+    assert second.acquire(factory)
+    assert not first.acquire(factory)
+
+    second.release(factory)
+    assert first.acquire(factory)
+    with factory() as session:
+        assert current_leader(session, "ingest")["holder"] == "api-1"
+
+
+def test_leader_lease_is_dropped_on_database_errors(tmp_path) -> None:
+    factory = _factory(tmp_path)
+    lease = LeaderLease("ingest", ttl_seconds=60, holder="api-1")
+    assert lease.acquire(factory)
+
+    unavailable = sessionmaker(bind=create_engine(f"sqlite:///{tmp_path / 'missing' / 'coordination.db'}"))
+    assert not lease.acquire(unavailable)
+    assert not lease.held
+
+
+def test_ingest_state_round_trips_between_processes(tmp_path) -> None:
+    factory = _factory(tmp_path)
+    with factory() as session:
+        store_state(session, {"source:1": {"ok": True}, "source:2": {"ok": False}, "cycle": {"ingested": 3}})
+        store_state(session, {"source:2": {"ok": True}})
+    with factory() as session:
+        assert load_state(session, "source:") == {"1": {"ok": True}, "2": {"ok": True}}
+        assert load_value(session, "cycle") == {"ingested": 3}
+        assert load_value(session, "missing") == {}
@@ -1,4 +1,9 @@
-from app.utils.dedupe import compute_dedupe, is_duplicate
+import random
+from datetime import datetime, timedelta
+
+from rapidfuzz import fuzz
+
+from app.utils.dedupe import DedupeIndex, TitleIndex, compute_dedupe, is_duplicate
 
 
 def test_dedupe_by_url_and_hash() -> None:
@@ -12,3 +17,61 @@ def test_dedupe_similarity() -> None:
     result = compute_dedupe("Breaking News", "Content", ["Breaking News"], "https://example.com")
     assert result.title_similarity >= 92
     assert is_duplicate(result, [], [])
+
+
+def test_dedupe_index_lookups_and_window() -> None:
+    index = DedupeIndex(window=timedelta(hours=1))
+    now = datetime.utcnow()
+    index.load([("https://a.com", "h1", "Old story", now - timedelta(hours=2))])
+    index.add("https://b.com", "h2", "Fresh story", now)
+
+    result = compute_dedupe("Fresh story", "Body", index.titles, "https://c.com")
+    assert is_duplicate(result, index.urls, index.hashes)
+
+    assert index.prune(now) == 1
+    assert "https://a.com" not in index.urls
+    assert "Old story" not in index.titles
+    assert len(index) == 1
+
+
+def test_title_index_matches_linear_scan() -> None:
+    index = TitleIndex()
+    titles = ["Gold jumps as dollar slides on Fed rate cut bets", "Oil steadies after OPEC meeting"]
+    for title in titles:
+        index.add(title)
+
+    probe = "Gold jumps as dollar slides on Fed rate cut bets!"
+    result = compute_dedupe(probe, "Body", index, "https://x.com")
+    assert result.title_similarity == compute_dedupe(probe, "Body", titles, "https://x.com").title_similarity
+    assert result.title_similarity >= 92
+    assert index.candidates("Bitcoin rallies to record high") == []
+
+    index.remove(titles[0])
+    assert titles[0] not in index
+    assert compute_dedupe(titles[0], "Body", index, "https://x.com").title_similarity < 92
+
+
+def test_title_index_finds_inflected_rewording() -> None:
+    index = TitleIndex()
+    stored = "Gold prices rise as dollar weakens after Fed signals rate cuts"
+    index.add(stored)
+    index.add("Oil steadies after OPEC meeting")
+
+    probe = "Gold price rises as dollars weaken after Fed signal rate cuts"
+    assert fuzz.ratio(probe, stored) >= 92
+    assert index.candidates(probe) == [stored]
+    assert index.best_similarity(probe) == int(fuzz.ratio(probe, stored))
+    assert index.best_similarity("Gold prices fall as dollar firms before Fed decision") == 0
+
+
+def test_title_index_candidates_stay_selective_with_shared_vocabulary() -> None:
+    rng = random.Random(1)
+    words = "gold oil fed ecb rate cut dollar yen euro bitcoin rises falls slips jumps on as after before cpi jobs".split()
+    stored = [" ".join(rng.choice(words) for _ in range(8)).capitalize() for _ in range(2000)]
+    index = TitleIndex()
+    for title in stored:
+        index.add(title)
+
+    candidates = index.candidates(stored[0] + "!")
+    assert stored[0] in candidates
+    assert len(candidates) < 20
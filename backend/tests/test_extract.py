@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from app.sources import extract
+from app.sources.extract import extract_page
+
+PAGE = """<!DOCTYPE html><html><head><title>Fallback &amp; title</title>
+<meta property="og:title" content="Fed holds rates">
+<meta property="article:published_time" content="2024-03-06T09:30:00+01:00">
+<link rel="canonical" href="/markets/fed-holds">
+<script>var state = "<p>not text</p>";</script><style>p { color: red }</style>
+</head><body><nav><a href="/">Home</a><a href="/markets">Markets</a></nav>
+<article><p>Policymakers kept rates &amp; guidance unchanged.</p><p>Gold edged higher.</p></article>
+<footer>Copyright</footer></body></html>"""
+
+
+def test_extract_page_reads_metadata_and_article_text(monkeypatch) -> None:
+    monkeypatch.setattr(extract, "LexborHTMLParser", None)
+    page = extract_page(PAGE, "https://wire.test/story?id=1")
+
+    assert page.title == "Fed holds rates"
+    assert page.canonical_url == "https://wire.test/markets/fed-holds"
+    assert page.published_at == datetime(2024, 3, 6, 8, 30)
+    assert page.text == "Policymakers kept rates & guidance unchanged. Gold edged higher."
+
+
+def test_extract_stream_stops_at_text_budget() -> None:
+    body = "".join(f"<p>Paragraph {index} about bullion demand.</p>" for index in range(5000))
+    title, text, meta, canonical = extract._extract_stream(f"<html><body>{body}</body></html>", budget=100)
+
+    assert text.startswith("Paragraph 0 ") and 100 < len(text) < 200
+    assert (title, meta, canonical) == ("", {}, None)
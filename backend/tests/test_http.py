@@ -0,0 +1,201 @@
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.models import RobotsTxt
+from app.utils.http import HostRegistry, ResponseCache
+from app.utils.robots import RobotsCache
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        if self.path == "/etag" and self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/flaky" and self.server.paths.count("/flaky") == 1:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/gone" and self.server.paths.count("/gone") > 1:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/trickle":
+            self.send_response(200)
+            self.send_header("Content-Length", "10")
+            self.end_headers()
+            for _ in range(10):
+                self.wfile.write(b"x")
+                self.wfile.flush()
+                time.sleep(0.1)
+            return
+        body = b"User-agent: *\nDisallow: /private\n" if self.path == "/robots.txt" else b"x" * 100
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        if self.path == "/etag":
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("ETag", '"v1"')
+        elif self.path == "/gone":
+            self.send_header("Cache-Control", "max-age=0")
+        elif self.path.startswith("/static"):
+            self.send_header("Cache-Control", "max-age=60")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.paths = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_robots_cache_persists_across_instances(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'robots.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    server, base = _serve()
+    registry = HostRegistry()
+    try:
+        first = RobotsCache(registry=registry, session_factory=factory)
+        assert first.allowed(f"{base}/news")
+        assert not first.allowed(f"{base}/private/page")
+        assert RobotsCache(registry=registry, session_factory=factory).allowed(f"{base}/news")
+        assert server.paths == ["/robots.txt"]
+
+        with factory() as session:
+            session.get(RobotsTxt, base.split("//")[1]).fetched_at = datetime.utcnow() - timedelta(days=2)
+            session.commit()
+        assert RobotsCache(registry=registry, session_factory=factory).allowed(f"{base}/news")
+        assert server.paths == ["/robots.txt", "/robots.txt"]
+    finally:
+        registry.close()
+        server.shutdown()
+
+
+def test_robots_fetch_does_not_block_other_domains() -> None:
+    release = threading.Event()
+
+    class _Registry:
+        def get(self, url, timeout):
+            if "slow.test" in url:
+                release.wait(5)
+            raise OSError("offline")
+
+    cache = RobotsCache(registry=_Registry())
+    slow = threading.Thread(target=cache.allowed, args=("https://slow.test/news",))
+    slow.start()
+    try:
+        time.sleep(0.05)
+        started = time.monotonic()
+        assert cache.allowed("https://fast.test/news")
+        assert time.monotonic() - started < 1
+    finally:
+        release.set()
+        slow.join()
+    assert cache.fetches == 2
+
+
+def test_host_registry_shares_rate_limit_and_connections() -> None:
+    server, base = _serve()
+    registry = HostRegistry()
+    try:
+        assert registry.client(f"{base}/a") is registry.client(f"{base}/b", min_interval=0.05)
+        started = time.monotonic()
+        for _ in range(3):
+            registry.get(f"{base}/page").raise_for_status()
+        assert time.monotonic() - started >= 0.1
+        assert registry.stats() == {"hosts": 1, "requests": 3}
+
+        started = time.monotonic()
+        with pytest.raises(requests.Timeout):
+            registry.get(f"{base}/trickle", timeout=0.35)
+        assert time.monotonic() - started < 0.6
+
+        assert registry.get(f"{base}/flaky").status_code == 200
+        assert server.paths[-2:] == ["/flaky", "/flaky"]
+    finally:
+        registry.close()
+        server.shutdown()
+
+
+def test_host_client_deadline_covers_silent_server() -> None:
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    accepted = []
+
+    def accept():
+        while True:
+            try:
+                accepted.append(listener.accept()[0])
+            except OSError:
+                return
+
+    threading.Thread(target=accept, daemon=True).start()
+    registry = HostRegistry()
+    try:
+        started = time.monotonic()
+        with pytest.raises(requests.Timeout):
+            registry.get(f"http://127.0.0.1:{listener.getsockname()[1]}/", timeout=0.5)
+        assert time.monotonic() - started < 1
+        assert len(accepted) == 1
+    finally:
+        registry.close()
+        listener.close()
+        for connection in accepted:
+            connection.close()
+
+
+def test_response_cache_revalidates_and_bounds_bytes(tmp_path) -> None:
+    server, base = _serve()
+    registry = HostRegistry()
+    try:
+        cache = ResponseCache(ttl_seconds=0, max_bytes=400, session=registry, path=str(tmp_path / "http.db"))
+        assert cache.get(f"{base}/static/1").content == b"x" * 100
+        assert cache.get(f"{base}/static/1").text == "x" * 100
+        assert cache.get(f"{base}/etag").status_code == 200
+        assert cache.get(f"{base}/etag").status_code == 200
+        assert server.paths == ["/static/1", "/etag", "/etag"]
+        assert (cache.hits, cache.misses, cache.revalidated) == (1, 2, 1)
+
+        for index in range(2, 6):
+            cache.get(f"{base}/static/{index}")
+        stats = cache.stats()
+        assert stats["bytes"] <= 400 and stats["entries"] < 6
+        cache.close()
+
+        restarted = ResponseCache(ttl_seconds=0, max_bytes=400, session=registry, path=str(tmp_path / "http.db"))
+        restarted.get(f"{base}/static/1")
+        assert server.paths[-1] == "/static/5"
+        assert restarted.stats()["disk_hits"] == 1
+
+        assert restarted.get(f"{base}/gone").status_code == 200
+        assert restarted.get(f"{base}/gone").status_code == 404
+        restarted.close()
+        reopened = ResponseCache(ttl_seconds=0, max_bytes=400, session=registry, path=str(tmp_path / "http.db"))
+        assert reopened.get(f"{base}/gone").status_code == 404
+        assert server.paths[-3:] == ["/gone", "/gone", "/gone"]
+        assert reopened.stats()["disk_hits"] == 0
+        reopened.close()
+    finally:
+        registry.close()
+        server.shutdown()
@@ -0,0 +1,16 @@
+from app.analysis.language import LanguageDetector
+
+
+def test_fast_tiers_skip_full_detector() -> None:
+    detector = LanguageDetector(sample_chars=200)
+    assert detector.detect("Gold rises as the dollar slides on the Fed outlook") == "en"
+    assert detector.detect("日銀は金融政策を維持した") == "ja"
+    assert detector.detect("Anything at all", hint="de") == "de"
+    assert set(detector.stats()) == {"ascii", "script", "hint"}
+
+
+def test_full_detector_is_deterministic() -> None:
+    detector = LanguageDetector()
+    text = "La Banque centrale européenne a relevé ses taux directeurs"
+    assert {detector.detect(text) for _ in range(5)} == {"fr"}
+    assert detector.stats()["full"]["count"] == 5
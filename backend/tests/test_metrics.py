@@ -0,0 +1,35 @@
+from app.main import metrics
+from app.metrics import Registry
+
+
+def test_registry_renders_prometheus_text() -> None:
+    registry = Registry()
+    latency = registry.histogram("fetch_seconds", "Fetch time.", ("source",), buckets=(0.1, 1.0))
+    dropped = registry.counter("dropped_total", "Dropped items.", ("reason",))
+    registry.callback("queue_depth", "Queued entries.", "gauge", lambda: {("write",): 3}, ("stage",))
+
+    for value in (0.05, 0.1, 0.5, 2.0):
+        latency.observe(value, source='Reuters "FX"')
+    dropped.inc(reason="url")
+    dropped.inc(2, reason="title")
+
+    lines = registry.render().splitlines()
+    assert "# TYPE fetch_seconds histogram" in lines
+    assert [line for line in lines if line.startswith("fetch_seconds_")] == [
+        'fetch_seconds_bucket{source="Reuters \\"FX\\"",le="0.1"} 2',
+        'fetch_seconds_bucket{source="Reuters \\"FX\\"",le="1"} 3',
+        'fetch_seconds_bucket{source="Reuters \\"FX\\"",le="+Inf"} 4',
+        'fetch_seconds_sum{source="Reuters \\"FX\\""} 2.65',
+        'fetch_seconds_count{source="Reuters \\"FX\\""} 4',
+    ]
+    assert 'dropped_total{reason="title"} 2' in lines and 'dropped_total{reason="url"} 1' in lines
+    assert 'queue_depth{stage="write"} 3' in lines
+
+
+def test_metrics_endpoint_exposes_ingest_and_stream_metrics() -> None:
+    response = metrics()
+    body = response.body.decode()
+    assert response.media_type.startswith("text/plain; version=0.0.4")
+    for name in ("ingest_fetch_seconds", "ingest_duplicates_total", "alerts_fired_total", "sse_subscribers"):
+        assert f"# TYPE {name} " in body
+    assert 'ingest_stage_queue_depth{stage="write"}' in body
@@ -0,0 +1,72 @@
+from datetime import datetime
+
+from sqlalchemy import create_engine, inspect, select
+
+from app import models  # noqa: F401
+from app.db import Base
+from app.migrations import MIGRATIONS, run_migrations
+
+
+def test_migrations_add_missing_indexes_once(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        for name in ("ix_news_items_url", "ix_news_items_hash", "ix_analyses_news_item_id"):
+            connection.exec_driver_sql(f"DROP INDEX {name}")
+        connection.exec_driver_sql("CREATE INDEX ix_news_items_hash ON news_items (hash)")
+        connection.execute(models.Source.__table__.insert(), [{"name": "Wire", "type": "rss", "config_json": "{}"}])
+        connection.execute(
+            models.NewsItem.__table__.insert(),
+            [
+                {"id": 1, "source_id": 1, "url": "u1", "title": "t", "hash": "h1", "fetched_at": datetime(2024, 1, 1)},
+                {"id": 2, "source_id": 1, "url": "u1", "title": "t", "hash": "h2", "fetched_at": datetime(2024, 1, 1)},
+                {"id": 3, "source_id": 1, "url": "u3", "title": "t", "hash": "h1", "fetched_at": datetime(2024, 1, 1)},
+            ],
+        )
+        connection.execute(
+            models.AlertEvent.__table__.insert(),
+            [{"alert_id": 1, "news_item_id": 2, "triggered_at": datetime(2024, 1, 1), "payload_json": "{}"}],
+        )
+
+    assert run_migrations(engine) == [version for version, _, _ in MIGRATIONS]
+    assert run_migrations(engine) == []
+
+    news_indexes = {index["name"]: index["unique"] for index in inspect(engine).get_indexes("news_items")}
+    assert news_indexes["ix_news_items_url"]
+    assert news_indexes["ix_news_items_hash"]
+    assert "ix_analyses_news_item_id" in {index["name"] for index in inspect(engine).get_indexes("analyses")}
+    with engine.connect() as connection:
+        assert list(connection.execute(select(models.NewsItem.id)).scalars()) == [1]
+        assert list(connection.execute(select(models.AlertEvent.id)).scalars()) == []
+
+
+def test_news_symbols_backfill(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'backfill.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(models.Source.__table__.insert(), [{"name": "Wire", "type": "rss", "config_json": "{}"}])
+        connection.execute(
+            models.NewsItem.__table__.insert(),
+            [{"id": 1, "source_id": 1, "url": "u", "title": "t", "hash": "h", "fetched_at": datetime(2024, 1, 1)}],
+        )
+        connection.execute(
+            models.Analysis.__table__.insert(),
+            [
+                {
+                    "news_item_id": 1,
+                    "impacted_symbols_json": '["XAU/USD", "DXY"]',
+                    "direction": "bullish",
+                    "confidence": 60,
+                    "horizon": "intraday",
+                    "rationale_json": "[]",
+                    "tags_json": "[]",
+                    "created_at": datetime(2024, 1, 1),
+                }
+            ],
+        )
+
+    run_migrations(engine)
+
+    with engine.connect() as connection:
+        rows = connection.execute(select(models.NewsSymbol.symbol).order_by(models.NewsSymbol.symbol)).scalars()
+        assert list(rows) == ["DXY", "XAU/USD"]
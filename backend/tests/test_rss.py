@@ -0,0 +1,88 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.sources import rss
+from app.sources.rss import FeedCache, fetch_rss, iter_rss
+
+FEED = b"""<?xml version="1.0"?><rss version="2.0"><channel><title>Wire</title>
+<item><title>Gold rallies</title><link>https://wire.test/1</link><description>Bullion bid</description></item>
+</channel></rss>"""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    body = FEED
+
+    def do_GET(self):
+        if self.path == "/etag" and self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        if self.path == "/etag":
+            self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(type(self).body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_fetch_rss_skips_unchanged_feeds() -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    cache = FeedCache()
+    try:
+        assert [item["title"] for item in fetch_rss(f"{base}/etag", cache=cache)] == ["Gold rallies"]
+        assert fetch_rss(f"{base}/etag", cache=cache) == []
+        assert cache.state(f"{base}/etag").stats() == {"hits": 1, "misses": 1, "last": "not_modified", "skipped": 0}
+
+        assert len(fetch_rss(f"{base}/plain", cache=cache)) == 1
+        assert fetch_rss(f"{base}/plain", cache=cache) == []
+        assert cache.state(f"{base}/plain").last == "unchanged"
+
+        _Handler.body = FEED.replace(b"Gold rallies", b"Gold slips")
+        assert [item["title"] for item in fetch_rss(f"{base}/plain", cache=cache, incremental=False)] == ["Gold slips"]
+    finally:
+        _Handler.body = FEED
+        server.shutdown()
+
+
+def _item(number: int) -> bytes:
+    return (
+        f"<item><title>Story {number}</title><link>https://wire.test/{number}</link>"
+        f"<pubDate>Mon, 01 Jan 2024 10:{number:02d}:00 GMT</pubDate><description>Body {number}</description></item>"
+    ).encode()
+
+
+def test_iter_rss_skips_entries_seen_on_last_poll(tmp_path, monkeypatch) -> None:
+    def write(numbers):
+        items = b"".join(_item(number) for number in numbers)
+        path.write_bytes(b'<?xml version="1.0"?><rss version="2.0"><channel>' + items + b"</channel></rss>")
+
+    def titles():
+        return [item["title"] for item in iter_rss(str(path), cache=cache)]
+
+    cleaned = []
+    monkeypatch.setattr(rss, "clean_text", lambda text: cleaned.append(text) or text)
+    path = tmp_path / "feed.xml"
+    cache = FeedCache()
+    write([3, 2, 1])
+    assert titles() == ["Story 3", "Story 2", "Story 1"]
+
+    write([5, 4, 3, 2, 1])
+    cleaned.clear()
+    assert titles() == ["Story 5", "Story 4"]
+    assert len(cleaned) == 6
+    assert cache.state(str(path)).skipped == 3
+
+    write([0, 6, 2, 1])
+    assert titles() == ["Story 0", "Story 6"]
+    assert len(fetch_rss(str(path), cache=cache, incremental=False)) == 4
+
+    cache = FeedCache()
+    write([1, 2])
+    assert titles() == ["Story 1", "Story 2"]
+    write([1, 2, 3])
+    assert titles() == ["Story 3"]
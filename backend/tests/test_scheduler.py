@@ -0,0 +1,233 @@
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+import requests
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import metrics, payloads, scheduler
+from app.alerts import AlertIndex
+from app.coordination import LeaderLease
+from app.db import Base, configure_sqlite
+from app.models import Alert, AlertEvent, Analysis, Lease, NewsItem, Source
+from app.payloads import PayloadCache, encode_payload, news_row_payload
+from app.polling import PollPlanner
+from app.sources.rss import FeedCache, FeedUpdate
+from app.utils.dedupe import DedupeIndex
+
+
+def _session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ingest.db'}")
+    configure_sqlite(engine)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def _patch_ingest(monkeypatch, factory, fetch, published) -> None:
+    monkeypatch.setattr(scheduler, "SessionLocal", factory)
+    monkeypatch.setattr(scheduler, "dedupe_index", DedupeIndex())
+    monkeypatch.setattr(scheduler, "payload_cache", PayloadCache(16))
+    monkeypatch.setattr(scheduler, "alert_index", AlertIndex())
+    monkeypatch.setattr(scheduler, "poll_planner", PollPlanner())
+    monkeypatch.setattr(payloads, "payload_cache", scheduler.payload_cache)
+    monkeypatch.setattr(scheduler, "_fetch_items", fetch)
+    monkeypatch.setattr(scheduler, "_publish", lambda payloads, received_at: published.extend(payloads))
+
+
+def test_pipeline_overlaps_fetches_and_times_out(tmp_path, monkeypatch) -> None:
+    def fake_fetch(job, demo):
+        time.sleep(min(job.config["delay"], job.timeout))
+        if job.config["delay"] > job.timeout:
+            raise requests.Timeout()
+        return [{"title": job.config["title"], "url": f"https://wire.test/{job.name}"}]
+
+    factory = _session_factory(tmp_path)
+    with factory() as session:
+        for name, delay, timeout, title in (
+            ("a", 0.3, 5, "Gold jumps on risk-off"),
+            ("b", 0.3, 5, "ECB holds deposit rate steady"),
+            ("slow", 2.0, 0.5, "Oil slides on inventory build"),
+        ):
+            config = {"delay": delay, "timeout": timeout, "title": title}
+            session.add(Source(name=name, type="rss", config_json=json.dumps(config), enabled=True))
+        session.commit()
+    published = []
+    _patch_ingest(monkeypatch, factory, fake_fetch, published)
+
+    started = time.monotonic()
+    cycle = scheduler.fetch_sources()
+    elapsed = time.monotonic() - started
+
+    assert cycle.done.is_set() and elapsed < 1.5
+    assert sorted(payload["source"] for payload in published) == ["a", "b"]
+    statuses = {job_status["error"] for job_status in scheduler.SOURCE_STATUS.values()}
+    assert "Timed out after 0.5s" in statuses
+    assert (cycle.sources, cycle.failed, cycle.ingested) == (3, 1, 2)
+    stages = scheduler.ingest_pipeline.stats()
+    assert list(stages) == ["fetch", "normalize", "analyze", "write"]
+    assert all(stage["depth"] == 0 for stage in stages.values())
+    assert stages["write"]["processed"] >= 1
+
+
+def test_fetch_sources_writes_cycle_in_one_batch(tmp_path, monkeypatch) -> None:
+    factory = _session_factory(tmp_path)
+    session = factory()
+    session.add(Source(name="Wire", type="rss", config_json=json.dumps({"url": "https://wire.test"}), enabled=True))
+    session.add(Alert(name="gold", rule_json=json.dumps({"symbol": "XAU/USD"}), enabled=True))
+    session.commit()
+
+    items = [
+        {"title": "Gold jumps on risk-off", "url": "https://wire.test/1", "content": "Risk-off bid"},
+        {"title": "Gold extends gains as bullion demand rises", "url": "https://wire.test/2", "content": "Bullion"},
+        {"title": "Gold jumps on risk-off", "url": "https://wire.test/1?utm_source=x", "content": "Risk-off bid"},
+    ]
+    published = []
+    _patch_ingest(monkeypatch, factory, lambda job, demo: items, published)
+    before = (
+        metrics.duplicates_dropped.value(reason="url"),
+        metrics.alerts_fired.value(),
+        metrics.fetch_seconds.count(source="Wire"),
+        metrics.commit_seconds.count(),
+    )
+
+    scheduler.fetch_sources()
+
+    after = (
+        metrics.duplicates_dropped.value(reason="url"),
+        metrics.alerts_fired.value(),
+        metrics.fetch_seconds.count(source="Wire"),
+        metrics.commit_seconds.count(),
+    )
+    assert [new - old for new, old in zip(after, before)] == [1, 1, 1, 1]
+    assert session.query(NewsItem).count() == 2
+    assert session.query(Analysis).count() == 2
+    assert session.query(AlertEvent).count() == 1
+    assert [payload["title"] for payload in published] == [item["title"] for item in items[:2]]
+    assert scheduler.CYCLE_STATUS["ingested"] == 2
+    for news in session.query(NewsItem):
+        assert scheduler.payload_cache.get(news.id) == encode_payload(news_row_payload(news))
+    status = next(iter(scheduler.SOURCE_STATUS.values()))
+    assert datetime.fromisoformat(status["next_poll"]) > datetime.utcnow()
+
+    monkeypatch.setattr(scheduler, "_fetch_items", lambda job, demo: 1 / 0)
+    scheduler.fetch_sources()
+    assert scheduler.CYCLE_STATUS["ingested"] == 2
+
+    session.query(Source).update({"enabled": False})
+    session.commit()
+    assert scheduler.fetch_sources() is None
+    assert scheduler.poll_planner.source_ids() == set()
+    session.close()
+
+
+def test_feed_state_saved_only_after_items_are_written(tmp_path, monkeypatch) -> None:
+    factory = _session_factory(tmp_path)
+    with factory() as session:
+        session.add(Source(name="Wire", type="rss", config_json=json.dumps({"url": "https://wire.test"}), enabled=True))
+        session.commit()
+
+    def fake_fetch(job, demo):
+        job.feed_update = FeedUpdate(job.config["url"], fetched=True, etag="v2", seen_keys={"https://wire.test/1"})
+        return [{"title": "Gold jumps on risk-off", "url": "https://wire.test/1"}]
+
+    published = []
+    _patch_ingest(monkeypatch, factory, fake_fetch, published)
+    cache = FeedCache()
+    monkeypatch.setattr(scheduler, "feed_cache", cache)
+    write_batch = scheduler._write_batch
+    monkeypatch.setattr(scheduler, "_write_batch", lambda session, batch: 1 / 0)
+
+    scheduler.fetch_sources(force=True)
+    assert cache.state("https://wire.test").etag is None
+    assert not cache.state("https://wire.test").seen("https://wire.test/1")
+
+    monkeypatch.setattr(scheduler, "_write_batch", write_batch)
+    scheduler.fetch_sources(force=True)
+    assert [payload["title"] for payload in published] == ["Gold jumps on risk-off"]
+    assert cache.state("https://wire.test").etag == "v2"
+    assert cache.state("https://wire.test").seen("https://wire.test/1")
+
+
+def test_analyze_failure_is_retried_on_next_poll(tmp_path, monkeypatch) -> None:
+    factory = _session_factory(tmp_path)
+    with factory() as session:
+        session.add(Source(name="Wire", type="rss", config_json=json.dumps({"url": "https://wire.test"}), enabled=True))
+        session.commit()
+    items = [{"title": "Gold jumps", "url": "https://wire.test/1"}]
+    published = []
+    _patch_ingest(monkeypatch, factory, lambda job, demo: items, published)
+    analyze_batch = scheduler.analyze_batch
+    calls = []
+
+    def flaky_analyze(items):
+        calls.append(len(items))
+        if len(calls) == 1:
+            raise RuntimeError("analysis pool crashed")
+        return analyze_batch(items)
+
+    monkeypatch.setattr(scheduler, "analyze_batch", flaky_analyze)
+    scheduler.fetch_sources(force=True)
+    scheduler.fetch_sources(force=True)
+
+    assert calls == [1, 1]
+    with factory() as session:
+        assert [news.title for news in session.query(NewsItem)] == ["Gold jumps"]
+
+
+def test_regaining_ingest_lease_reloads_dedupe_and_alert_state(tmp_path, monkeypatch) -> None:
+    factory = _session_factory(tmp_path)
+    _patch_ingest(monkeypatch, factory, lambda job, demo: [], [])
+    lease = LeaderLease("ingest", ttl_seconds=60, holder="worker-1")
+    other = LeaderLease("ingest", ttl_seconds=60, holder="worker-2")
+    monkeypatch.setattr(scheduler, "ingest_lease", lease)
+    monkeypatch.setattr(scheduler, "fetch_sources", lambda wait: None)
+
+    def expire() -> None:
+        with factory() as session:
+            session.query(Lease).update({"expires_at": datetime.utcnow() - timedelta(seconds=1)})
+            session.commit()
+
+    def tick(expect_reload: bool) -> None:
+        scheduler.dedupe_index.warmed = True
+        scheduler.alert_index.loaded = True
+        scheduler.ingest_tick()
+        assert scheduler.dedupe_index.warmed is not expect_reload
+        assert scheduler.alert_index.loaded is not expect_reload
+
+    tick(expect_reload=True)
+    tick(expect_reload=False)
+    expire()
+    assert other.acquire(factory)
+    tick(expect_reload=False)
+    assert not lease.held
+    expire()
+    tick(expect_reload=True)
+    assert lease.held
+
+
+def test_poll_planner_adapts_and_backs_off() -> None:
+    planner = PollPlanner(rng=random.Random(7))
+    config = {"poll_min_seconds": 60, "poll_max_seconds": 600}
+    now = datetime(2024, 1, 1)
+    assert planner.due(1, config, now)
+
+    intervals = [planner.record(1, config, True, 0, now).interval for _ in range(8)]
+    assert intervals == sorted(intervals) and intervals[-1] == 600
+    assert planner.record(1, config, True, 3, now).interval == 300
+    assert not planner.due(1, config, now + timedelta(seconds=200))
+
+    delays = []
+    for _ in range(5):
+        schedule = planner.record(1, config, False, 0, now)
+        delays.append((schedule.next_poll - now).total_seconds())
+    assert schedule.failures == 5
+    assert 60 <= delays[0] <= 120 and all(delay <= 600 for delay in delays)
+    assert planner.record(1, config, True, 1, now).failures == 0
+
+    for _ in range(1100):
+        schedule = planner.record(2, config, False, 0, now)
+    assert schedule.next_poll <= now + timedelta(seconds=600)
+    planner.forget(2)
+    assert planner.source_ids() == {1}
@@ -0,0 +1,188 @@
+import asyncio
+import json
+import re
+import threading
+import time
+
+from app.sse import HEARTBEAT_FRAME, EventHub, StreamFilter
+
+
+async def _subscribe(hub, count):
+    streams = [hub.subscribe() for _ in range(count)]
+    pending = [asyncio.ensure_future(stream.__anext__()) for stream in streams]
+    await asyncio.sleep(0)
+    return streams, pending
+
+
+def test_event_hub_shares_json_frame() -> None:
+    async def scenario():
+        hub = EventHub(heartbeat_seconds=0)
+        _, pending = await _subscribe(hub, 3)
+        await hub.publish({"id": 1, "title": "Gold €"})
+        return await asyncio.gather(*pending)
+
+    frames = asyncio.run(scenario())
+    assert frames[0] == 'id: 1\ndata: {"id":1,"title":"Gold €"}\n\n'.encode("utf-8")
+    assert all(frame is frames[0] for frame in frames)
+    assert json.loads(frames[0].split(b"data: ")[1]) == {"id": 1, "title": "Gold €"}
+
+
+def test_event_hub_drops_oldest_for_slow_consumers() -> None:
+    async def scenario():
+        hub = EventHub(queue_size=2, heartbeat_seconds=0)
+        _, pending = await _subscribe(hub, 1)
+        for index in range(6):
+            await hub.publish({"id": index})
+        return hub, await pending[0]
+
+    hub, frame = asyncio.run(scenario())
+    assert hub.dropped == 4
+    assert frame == b'id: 4\ndata: {"id":4}\n\n'
+
+
+def test_event_hub_disconnects_slow_consumers() -> None:
+    async def scenario():
+        hub = EventHub(queue_size=2, policy="disconnect", heartbeat_seconds=0)
+        _, pending = await _subscribe(hub, 1)
+        for index in range(3):
+            await hub.publish({"id": index})
+        try:
+            await pending[0]
+        except StopAsyncIteration:
+            return hub, True
+        return hub, False
+
+    hub, ended = asyncio.run(scenario())
+    assert ended
+    assert hub.disconnected == 1
+    assert len(hub) == 0
+
+
+def test_event_hub_sends_heartbeats() -> None:
+    async def scenario():
+        hub = EventHub(heartbeat_seconds=0.01)
+        _, pending = await _subscribe(hub, 1)
+        return await asyncio.wait_for(pending[0], timeout=1)
+
+    assert asyncio.run(scenario()) == HEARTBEAT_FRAME
+
+
+def test_event_hub_publishes_batches_from_other_threads() -> None:
+    async def scenario():
+        hub = EventHub(heartbeat_seconds=0)
+        _, pending = await _subscribe(hub, 2)
+        sent_at = time.time()
+        worker = threading.Thread(target=hub.publish_threadsafe, args=([{"id": 1}, {"id": 2}], sent_at))
+        worker.start()
+        frames = await asyncio.wait_for(asyncio.gather(*pending), timeout=1)
+        worker.join()
+        return hub, frames
+
+    hub, frames = asyncio.run(scenario())
+    assert frames[0] == b'id: 1\ndata: {"id":1}\n\nid: 2\ndata: {"id":2}\n\n'
+    assert frames[0] is frames[1]
+    stats = hub.stats()
+    assert (stats["published"], stats["batches"]) == (2, 1)
+    assert 0 <= stats["latency_ms"]["max"] < 1000
+    assert not hub.publish_threadsafe([{"id": 3}])
+
+
+def test_event_hub_resumes_from_ring_buffer_or_backfill() -> None:
+    backfill_calls = []
+
+    def backfill(after_id, limit):
+        backfill_calls.append(after_id)
+        return [(event_id, b'{"id":%d}' % event_id) for event_id in range(after_id + 1, 4)]
+
+    async def scenario(last_event_id):
+        hub = EventHub(heartbeat_seconds=0, replay_size=3)
+        for index in range(1, 7):
+            await hub.publish({"id": index})
+        stream = hub.subscribe(last_event_id=last_event_id, backfill=backfill)
+        replay = await stream.__anext__()
+        waiting = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+        await hub.publish({"id": 7})
+        return replay, await waiting
+
+    replay, live = asyncio.run(scenario(4))
+    assert replay == b'id: 5\ndata: {"id":5}\n\nid: 6\ndata: {"id":6}\n\n'
+    assert live == b'id: 7\ndata: {"id":7}\n\n'
+    assert backfill_calls == []
+
+    replay, live = asyncio.run(scenario(1))
+    assert replay == b'id: 2\ndata: {"id":2}\n\nid: 3\ndata: {"id":3}\n\n'
+    assert live == b'id: 7\ndata: {"id":7}\n\n'
+    assert backfill_calls == [1]
+
+
+def test_event_hub_backfill_pages_forward_through_large_gaps() -> None:
+    calls = []
+
+    def backfill(after_id, limit):
+        calls.append(after_id)
+        return [(event_id, b'{"id":%d}' % event_id) for event_id in range(after_id + 1, min(after_id + limit, 7) + 1)]
+
+    async def scenario():
+        hub = EventHub(heartbeat_seconds=0, replay_size=3)
+        stream = hub.subscribe(last_event_id=0, backfill=backfill)
+        return [await stream.__anext__() for _ in range(3)]
+
+    pages = asyncio.run(scenario())
+    assert [re.findall(rb"id: (\d+)", page) for page in pages] == [[b"1", b"2", b"3"], [b"4", b"5", b"6"], [b"7"]]
+    assert calls == [0, 3, 6]
+
+
+def test_event_hub_filters_once_per_group() -> None:
+    events = [
+        {"id": 1, "source": "Wire", "analysis": {"impacted_symbols": ["BTC"], "direction": "bullish", "confidence": 80}},
+        {"id": 2, "source": "Desk", "analysis": {"impacted_symbols": ["XAU/USD"], "direction": "bearish", "confidence": 40}},
+        {"id": 3, "source": "Wire", "analysis": None},
+    ]
+    btc = StreamFilter(symbol="BTC")
+
+    async def scenario():
+        hub = EventHub(heartbeat_seconds=0)
+        streams = [
+            hub.subscribe(stream_filter=btc),
+            hub.subscribe(stream_filter=btc),
+            hub.subscribe(stream_filter=StreamFilter(min_confidence=50)),
+            hub.subscribe(stream_filter=StreamFilter(source="Desk", direction="bearish")),
+            hub.subscribe(),
+        ]
+        pending = [asyncio.ensure_future(stream.__anext__()) for stream in streams]
+        await asyncio.sleep(0)
+        assert hub.stats()["filter_groups"] == 4
+        hub.publish_threadsafe(events)
+        return await asyncio.gather(*pending)
+
+    frames = asyncio.run(scenario())
+    ids = [[json.loads(body)["id"] for body in re.findall(rb"^data: (.*)$", frame, re.M)] for frame in frames]
+    assert ids == [[1], [1], [1, 3], [2], [1, 2, 3]]
+    assert frames[0] is frames[1]
+
+
+def test_event_hub_relay_skips_events_already_published() -> None:
+    polls = []
+
+    def poll(after_id, limit):
+        polls.append(after_id)
+        return [(event_id, b'{"id":%d}' % event_id) for event_id in range(after_id + 1, 5)]
+
+    async def scenario():
+        hub = EventHub(heartbeat_seconds=0)
+        streams, pending = await _subscribe(hub, 1)
+        await hub.publish({"id": 1})
+        await hub.publish({"id": 2})
+        relay = asyncio.ensure_future(hub.relay(poll, interval=0.01))
+        frames = [await pending[0]]
+        while b"id: 4" not in frames[-1]:
+            frames.append(await asyncio.wait_for(streams[0].__anext__(), 5))
+        relay.cancel()
+        await hub.publish({"id": 3})
+        return hub, b"".join(frames)
+
+    hub, frames = asyncio.run(scenario())
+    assert re.findall(rb"^id: (\d+)", frames, re.M) == [b"1", b"2", b"3", b"4"]
+    assert polls[0] == 2
+    assert (hub.stats()["relayed"], hub.last_id) == (2, 4)
@@ -48,29 +48,57 @@ export default function App() {
   const [sources, setSources] = useState<string[]>([])
   const [status, setStatus] = useState<Record<string, SourceStatus>>({})
   const feedRef = useRef<HTMLDivElement>(null)
+  const pausedRef = useRef(paused)
+  const lastEventId = useRef(0)
+
+  useEffect(() => {
+    pausedRef.current = paused
+  }, [paused])
 
   useEffect(() => {
     fetch('/api/news')
       .then((res) => res.json())
       .then((data: NewsItem[]) => {
-        setItems(data)
+        setItems((prev) => {
+          const seen = new Set(prev.map((item) => item.id))
+          return [...prev, ...data.filter((item) => !seen.has(item.id))].slice(0, 200)
+        })
         if (data.length > 0) {
-          setSelected(data[0])
+          lastEventId.current = Math.max(lastEventId.current, data[0].id)
+          setSelected((current) => current ?? data[0])
         }
       })
     fetch('/api/sources')
       .then((res) => res.json())
       .then((data) => setSources(data.map((source: { name: string }) => source.name)))
-    const eventSource = new EventSource('/api/stream')
-    eventSource.onmessage = (event) => {
-      const parsed: NewsItem = JSON.parse(event.data)
-      setItems((prev) => [parsed, ...prev].slice(0, 200))
-      if (!paused) {
-        setSelected(parsed)
+  }, [])
+
+  useEffect(() => {
+    let eventSource: EventSource
+    let retry: number | undefined
+    const connect = () => {
+      const resume = lastEventId.current ? `?last_event_id=${lastEventId.current}` : ''
+      eventSource = new EventSource(`/api/stream${resume}`)
+      eventSource.onmessage = (event) => {
+        const parsed: NewsItem = JSON.parse(event.data)
+        lastEventId.current = Math.max(lastEventId.current, Number(event.lastEventId) || parsed.id)
+        setItems((prev) => (prev.some((item) => item.id === parsed.id) ? prev : [parsed, ...prev].slice(0, 200)))
+        if (!pausedRef.current) {
+          setSelected(parsed)
+        }
+      }
+      eventSource.onerror = () => {
+        if (eventSource.readyState === EventSource.CLOSED) {
+          retry = window.setTimeout(connect, 3000)
+        }
       }
     }
-    return () => eventSource.close()
-  }, [paused])
+    connect()
+    return () => {
+      window.clearTimeout(retry)
+      eventSource.close()
+    }
+  }, [])
 
   useEffect(() => {
     if (autoScroll && feedRef.current) {